@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    from aoc_executor import ExecutionResult
+
+BASE_DIR = Path(__file__).parent.resolve()
+DEFAULT_INDEX_PATH = BASE_DIR / ".aoc" / "attempts.sqlite"
+
+# e.g. solution_part2_try5_openai_gpt_4o.py, solution_part1_try1.py, solution_part2_human_takeover.py
+SOLUTION_NAME_PATTERN = re.compile(
+    r"solution_part(?P<part>\d)(?:_try(?P<attempt>\d+))?(?:_(?P<provider>openai|anthropic|local)_(?P<model>\w+))?"
+)
+DAY_DIR_PATTERN = re.compile(r"day(\d+)")
+
+
+@dataclass
+class AttemptEntry:
+    """What the index knows about one solution file."""
+    path: str
+    content_hash: str
+    day: Optional[int]
+    part: Optional[int]
+    attempt: Optional[int]
+    provider: Optional[str]
+    model: Optional[str]
+    saved_at: float
+    answers: Optional[list[str]] = None
+    expected_answer: Optional[str] = None
+    correct: Optional[bool] = None
+    returncode: Optional[int] = None
+    runtime: Optional[float] = None
+    cpu_time: Optional[float] = None
+    peak_memory_mb: Optional[float] = None
+    run_at: Optional[float] = None
+
+    @property
+    def answer(self) -> Optional[str]:
+        """The last answer the solution printed."""
+        return self.answers[-1] if self.answers else None
+
+
+def content_hash(source: str) -> str:
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def describe_path(path: Path) -> dict:
+    """Work out the day, part, attempt, provider and model of a solution file from its path."""
+    day_dir = next((parent for parent in path.parents if DAY_DIR_PATTERN.fullmatch(parent.name)), None)
+    match = SOLUTION_NAME_PATTERN.match(path.stem)
+    return {
+        "day": int(DAY_DIR_PATTERN.fullmatch(day_dir.name)[1]) if day_dir else None,
+        "part": int(match["part"]) if match else None,
+        "attempt": int(match["attempt"]) if match and match["attempt"] else None,
+        "provider": match["provider"] if match else None,
+        "model": match["model"] if match else None
+    }
+
+
+class AttemptIndex:
+    """
+    SQLite index of solution attempts and what running them produced.
+
+    Files are keyed by path and carry the hash of their contents, so a run result is
+    only reused while the file is unchanged. Like the response cache, every operation
+    opens its own connection so the index can be shared between threads and processes.
+    """
+
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS attempts (
+                    path TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    day INTEGER,
+                    part INTEGER,
+                    attempt INTEGER,
+                    provider TEXT,
+                    model TEXT,
+                    saved_at REAL NOT NULL,
+                    answers TEXT,
+                    expected_answer TEXT,
+                    correct INTEGER,
+                    returncode INTEGER,
+                    runtime REAL,
+                    cpu_time REAL,
+                    peak_memory_mb REAL,
+                    run_at REAL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS attempts_day_part ON attempts (day, part)")
+            conn.execute("CREATE INDEX IF NOT EXISTS attempts_content_hash ON attempts (content_hash)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def record_saved(self,
+                     solution_path: Path,
+                     source: str,
+                     day: Optional[int] = None,
+                     part: Optional[int] = None,
+                     attempt: Optional[int] = None,
+                     provider: Optional[str] = None,
+                     model: Optional[str] = None):
+        """
+        Record a saved attempt, replacing anything known about an earlier file at the same path.
+
+        Details not given are worked out from the path.
+        """
+        solution_path = solution_path.resolve()
+        described = describe_path(solution_path)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO attempts (path, content_hash, day, part, attempt, provider, model, saved_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(solution_path), content_hash(source),
+                 day if day is not None else described["day"],
+                 part if part is not None else described["part"],
+                 attempt if attempt is not None else described["attempt"],
+                 provider or described["provider"],
+                 model or described["model"],
+                 time.time())
+            )
+
+    def record_run(self, result: ExecutionResult):
+        """Record what running an attempt produced."""
+        path = result.solution_path.resolve()
+        source = path.read_text(encoding="utf-8", errors="replace")
+        if (entry := self.get(path)) is None or entry.content_hash != content_hash(source):
+            self.record_saved(path, source)
+
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE attempts SET answers = ?, expected_answer = ?, correct = ?, returncode = ?, runtime = ?, "
+                "cpu_time = ?, peak_memory_mb = ?, run_at = ? WHERE path = ?",
+                (json.dumps(result.answers), result.expected_answer, result.correct, result.returncode,
+                 result.duration, result.cpu_time, result.peak_memory_mb, time.time(), str(path))
+            )
+
+    @staticmethod
+    def _entry(row: sqlite3.Row) -> AttemptEntry:
+        values = dict(row)
+        values["answers"] = json.loads(values["answers"]) if values["answers"] is not None else None
+        values["correct"] = bool(values["correct"]) if values["correct"] is not None else None
+        return AttemptEntry(**values)
+
+    def get(self, solution_path: Path) -> Optional[AttemptEntry]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM attempts WHERE path = ?", (str(solution_path.resolve()),)).fetchone()
+        return self._entry(row) if row else None
+
+    def lookup_run(self, solution_path: Path) -> Optional[AttemptEntry]:
+        """The recorded run of a file, provided the file hasn't changed since it was run."""
+        entry = self.get(solution_path)
+        if entry is None or entry.run_at is None:
+            return None
+        if entry.content_hash != content_hash(solution_path.read_text(encoding="utf-8", errors="replace")):
+            return None
+        return entry
+
+    def query(self,
+              day: Optional[int] = None,
+              part: Optional[int] = None,
+              model: Optional[str] = None,
+              correct: Optional[bool] = None) -> list[AttemptEntry]:
+        """Find attempts, optionally filtered by day, part, model (substring) and correctness."""
+        conditions, parameters = [], []
+        if day is not None:
+            conditions.append("day = ?")
+            parameters.append(day)
+        if part is not None:
+            conditions.append("part = ?")
+            parameters.append(part)
+        if model is not None:
+            # Names parsed from file names have '_' for '-', and '_' matches any single character in LIKE
+            conditions.append("model LIKE ?")
+            parameters.append(f"%{model.replace('-', '_')}%")
+        if correct is not None:
+            conditions.append("correct = ?")
+            parameters.append(correct)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT * FROM attempts {where} ORDER BY day, part, attempt, path", parameters)
+            return [self._entry(row) for row in rows.fetchall()]
+
+    def scan(self, base_dir: Path = BASE_DIR, run: bool = False) -> tuple[int, int]:
+        """
+        Index every solution file under the day directories.
+
+        Args:
+            base_dir: Directory holding the dayN folders
+            run: Also run the files that have no up-to-date run recorded (against the stored answer, if any)
+
+        Returns:
+            How many files were newly indexed (or changed) and how many were run
+        """
+        from aoc_executor import load_expected_answer, run_solution
+        from aoc_worker_pool import get_worker_pool
+
+        indexed = ran = 0
+        for solution_path in sorted(base_dir.glob("day*/**/solution_part*.py")):
+            source = solution_path.read_text(encoding="utf-8", errors="replace")
+            entry = self.get(solution_path)
+            if entry is None or entry.content_hash != content_hash(source):
+                self.record_saved(solution_path, source)
+                indexed += 1
+
+            if run and self.lookup_run(solution_path) is None:
+                described = describe_path(solution_path.resolve())
+                day_dir = base_dir / f"day{described['day']}"
+                expected_answer = load_expected_answer(day_dir, described["part"]) if described["part"] else None
+                print(f"Running {solution_path.relative_to(base_dir)}")
+                run_solution(solution_path, expected_answer, index=self, pool=get_worker_pool())
+                ran += 1
+        return indexed, ran
+
+
+def format_entries(entries: list[AttemptEntry], base_dir: Path = BASE_DIR) -> str:
+    header = f"{'Day':<5}{'Part':<6}{'Try':<5}{'Model':<28}{'Answer':<18}{'Correct':<9}{'Runtime':>9}{'Peak MB':>9}  File"
+    lines = [header, "-" * len(header)]
+    for entry in entries:
+        path = Path(entry.path)
+        file = path.relative_to(base_dir) if path.is_relative_to(base_dir) else path
+        correct = "-" if entry.correct is None else ("yes" if entry.correct else "no")
+        runtime = f"{entry.runtime:.2f}s" if entry.runtime is not None else "-"
+        peak = f"{entry.peak_memory_mb:.0f}" if entry.peak_memory_mb is not None else "-"
+        lines.append(f"{entry.day or '-':<5}{entry.part or '-':<6}{entry.attempt or '-':<5}{entry.model or '-':<28}"
+                     f"{(entry.answer or '-')[:17]:<18}{correct:<9}{runtime:>9}{peak:>9}  {file}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index solution attempts and what they produced")
+    parser.add_argument("--index", type=Path, default=DEFAULT_INDEX_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan_parser = commands.add_parser("scan", help="Index the existing solution files")
+    scan_parser.add_argument("--run", action="store_true", help="Run files without an up-to-date result")
+
+    query_parser = commands.add_parser("query", help="List indexed attempts")
+    query_parser.add_argument("--day", type=int)
+    query_parser.add_argument("--part", type=int)
+    query_parser.add_argument("--model")
+    correctness = query_parser.add_mutually_exclusive_group()
+    correctness.add_argument("--correct", dest="correct", action="store_const", const=True)
+    correctness.add_argument("--incorrect", dest="correct", action="store_const", const=False)
+    args = parser.parse_args()
+
+    index = AttemptIndex(args.index)
+    if args.command == "scan":
+        indexed, ran = index.scan(run=args.run)
+        print(f"Indexed {indexed} new or changed files, ran {ran}")
+    else:
+        print(format_entries(index.query(args.day, args.part, args.model, args.correct)))
@@ -0,0 +1,209 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from aoc_executor import load_expected_answer
+from aoc_llm_solver import CascadePolicy, ModelProvider, solve_puzzle
+from aoc_rate_limiter import format_rate_limiter_metrics
+
+BASE_DIR = Path(__file__).parent.resolve()
+DEFAULT_CHECKPOINT_PATH = BASE_DIR / ".aoc" / "batch_checkpoint.json"
+
+
+class BatchCheckpoint:
+    """
+    Progress of a batch run, saved after every job so an interrupted run can resume.
+
+    Jobs are keyed by "day:part" and hold their status ("verified", "failed", "blocked"
+    or "no_answer"), the verified solution path and how long they took.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CHECKPOINT_PATH):
+        self.path = path
+        self.jobs: dict[str, dict] = {}
+        if path.exists():
+            with open(path, "r") as f:
+                self.jobs = json.load(f)
+
+    @staticmethod
+    def key(day: int, part: int) -> str:
+        return f"{day}:{part}"
+
+    def verified_path(self, day: int, part: int) -> Optional[Path]:
+        job = self.jobs.get(self.key(day, part))
+        if job and job["status"] == "verified" and Path(job["solution_path"]).exists():
+            return Path(job["solution_path"])
+        return None
+
+    def record(self, day: int, part: int, status: str, solution_path: Optional[Path] = None, duration: float = 0.0):
+        self.jobs[self.key(day, part)] = {
+            "status": status,
+            "solution_path": str(solution_path) if solution_path else None,
+            "duration": duration
+        }
+        self.save()
+
+    def save(self):
+        # Write to a temporary file first so an interruption never leaves a half-written checkpoint
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.jobs, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+async def run_batch(
+        days: list[int],
+        provider: ModelProvider = ModelProvider.OPENAI,
+        model_name: str = "gpt-4o",
+        concurrency: int = 4,
+        max_attempts: Optional[int] = None,
+        checkpoint: Optional[BatchCheckpoint] = None,
+        cascade: Optional[CascadePolicy] = None,
+        repair_mode: bool = False
+) -> BatchCheckpoint:
+    """
+    Solve both parts of several days unattended with bounded concurrency.
+
+    Each day's part 2 starts as soon as its part 1 is verified, using the verified part 1
+    file as its starting point. Jobs already verified in the checkpoint are skipped.
+
+    Args:
+        days: The days to solve
+        provider: The model provider to use
+        model_name: The specific model to use
+        concurrency: Maximum number of jobs running at once
+        max_attempts: Maximum attempts per job before giving up (defaults to 5, or with a
+            cascade to enough attempts for every model in its ladder)
+        checkpoint: Where to record progress (defaults to .aoc/batch_checkpoint.json)
+        cascade: Escalate through a ladder of models instead of using provider/model_name
+        repair_mode: Ask for SEARCH/REPLACE edits to the last attempt after feedback
+
+    Returns:
+        The checkpoint holding the outcome of every job
+    """
+    checkpoint = checkpoint or BatchCheckpoint()
+    if max_attempts is None:
+        max_attempts = cascade.attempts_to_top if cascade else 5
+    slots = asyncio.Semaphore(concurrency)
+    ran_jobs: list[str] = []
+    start = time.perf_counter()
+
+    async def run_job(day: int, part: int, part1_solution_path: Optional[Path] = None) -> Optional[Path]:
+        if verified_path := checkpoint.verified_path(day, part):
+            print(f"\nDay {day} part {part} already verified: {verified_path}")
+            return verified_path
+
+        if load_expected_answer(BASE_DIR / f"day{day}", part) is None:
+            print(f"\nSkipping day {day} part {part}: no stored answer to verify against")
+            checkpoint.record(day, part, "no_answer")
+            return None
+
+        async with slots:
+            job_start = time.perf_counter()
+            solution_path = await asyncio.to_thread(
+                solve_puzzle,
+                day=day,
+                part=part,
+                provider=provider,
+                model_name=model_name,
+                part1_solution_path=part1_solution_path,
+                max_attempts=max_attempts,
+                cascade=cascade,
+                repair_mode=repair_mode
+            )
+            duration = time.perf_counter() - job_start
+
+        checkpoint.record(day, part, "verified" if solution_path else "failed", solution_path, duration)
+        ran_jobs.append(checkpoint.key(day, part))
+        print(f"\nDay {day} part {part} {'verified' if solution_path else 'failed'} in {duration:.1f}s")
+        return solution_path
+
+    async def run_day(day: int):
+        part1_solution_path = await run_job(day, 1)
+        if part1_solution_path is None:
+            if not checkpoint.verified_path(day, 2):
+                checkpoint.record(day, 2, "blocked")
+            return
+        await run_job(day, 2, part1_solution_path)
+
+    await asyncio.gather(*(run_day(day) for day in days))
+
+    print_summary(checkpoint, days, ran_jobs, time.perf_counter() - start)
+    if cascade:
+        print(f"\nModel cascade:\n{cascade.report()}")
+    return checkpoint
+
+
+def print_summary(checkpoint: BatchCheckpoint, days: list[int], ran_jobs: list[str], wall_time: float):
+    """Print each job's outcome and the throughput of the jobs run this time."""
+    print(f"\n{'Day':<5}{'Part':<6}{'Status':<12}{'Time':>8}")
+    for day in days:
+        for part in (1, 2):
+            job = checkpoint.jobs.get(checkpoint.key(day, part), {"status": "pending", "duration": 0.0})
+            print(f"{day:<5}{part:<6}{job['status']:<12}{job['duration']:>7.1f}s")
+
+    verified = sum(checkpoint.jobs[key]["status"] == "verified" for key in ran_jobs)
+    job_time = sum(checkpoint.jobs[key]["duration"] for key in ran_jobs)
+    print(f"\nRan {len(ran_jobs)} jobs and verified {verified} in {wall_time:.1f}s wall time "
+          f"({verified / wall_time * 3600 if wall_time else 0:.1f} parts/hour, "
+          f"{job_time / wall_time if wall_time else 0:.1f}x concurrency speedup)")
+    if rate_limiter_metrics := format_rate_limiter_metrics():
+        print(f"\nRate limiting:\n{rate_limiter_metrics}")
+
+    # Only loaded if a provider client was created, otherwise there's nothing to report
+    client_pool = sys.modules.get("aoc_client_pool")
+    if client_pool and (client_pool_metrics := client_pool.format_client_pool_metrics()):
+        print(f"\nConnection reuse:\n{client_pool_metrics}")
+
+
+def parse_days(days: str) -> list[int]:
+    """Parse a day selection like "1-25" or "1,3,5-7"."""
+    selected = []
+    for chunk in days.split(","):
+        first, _, last = chunk.partition("-")
+        selected.extend(range(int(first), int(last or first) + 1))
+    return selected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve a range of days unattended")
+    parser.add_argument("--days", default="1-25", help="Days to solve, e.g. 1-25 or 1,3,5-7")
+    parser.add_argument("--provider", type=ModelProvider, default=ModelProvider.OPENAI)
+    parser.add_argument("--model", default="gpt-4o")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--max-attempts", type=int,
+                        help="Attempts per part (defaults to 5, or enough for the whole ladder with --cascade)")
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT_PATH)
+    parser.add_argument("--restart", action="store_true", help="Ignore any saved progress")
+    parser.add_argument("--cascade", action="store_true",
+                        help="Start with gpt-4o-mini and escalate to gpt-4o, then claude-3.5-sonnet, as attempts fail")
+    parser.add_argument("--failures-per-level", type=int, default=2)
+    parser.add_argument("--day-deadline", type=float, help="Seconds each day may take with --cascade")
+    parser.add_argument("--day-budget", type=float, help="USD each day may cost with --cascade")
+    parser.add_argument("--repair", action="store_true",
+                        help="Ask for SEARCH/REPLACE edits to the last attempt instead of whole programs")
+    args = parser.parse_args()
+
+    if args.restart and args.checkpoint.exists():
+        args.checkpoint.unlink()
+
+    asyncio.run(run_batch(
+        days=parse_days(args.days),
+        provider=args.provider,
+        model_name=args.model,
+        concurrency=args.concurrency,
+        max_attempts=args.max_attempts,
+        checkpoint=BatchCheckpoint(args.checkpoint),
+        cascade=CascadePolicy(
+            failures_per_level=args.failures_per_level,
+            day_deadline=args.day_deadline,
+            day_budget=args.day_budget
+        ) if args.cascade else None,
+        repair_mode=args.repair
+    ))
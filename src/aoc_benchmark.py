@@ -0,0 +1,390 @@
+import argparse
+import csv
+import json
+import math
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from aoc_attempt_index import describe_path
+from aoc_executor import run_solution
+from aoc_input_generators import GENERATORS, generate_input
+
+BASE_DIR = Path(__file__).parent.resolve()
+DEFAULT_BASELINE_PATH = BASE_DIR / ".aoc" / "benchmark_baseline.json"
+
+DEFAULT_RUNS = 5
+DEFAULT_WARMUP = 1
+DEFAULT_TOLERANCE = 0.2
+DEFAULT_TIMEOUT_SECONDS = 60.0
+# Generated inputs get big, so scaling runs repeat less
+DEFAULT_SCALING_RUNS = 3
+
+# Differences smaller than this are launch jitter, not regressions, however large the ratio
+NOISE_FLOOR_SECONDS = 0.02
+
+
+@dataclass
+class BenchmarkResult:
+    """Repeated measurements of one solution."""
+    solution: str
+    day: Optional[int]
+    part: Optional[int]
+    wall_times: list[float] = field(default_factory=list)
+    cpu_times: list[float] = field(default_factory=list)
+    peak_rss_mb: list[float] = field(default_factory=list)
+    timed_out: bool = False
+    failed: bool = False
+
+    @property
+    def wall_time(self) -> float:
+        return statistics.median(self.wall_times) if self.wall_times else 0.0
+
+    @property
+    def cpu_time(self) -> float:
+        return statistics.median(self.cpu_times) if self.cpu_times else 0.0
+
+    @property
+    def peak_rss(self) -> float:
+        return max(self.peak_rss_mb, default=0.0)
+
+    def summary(self) -> dict:
+        return {
+            **asdict(self),
+            "median_wall_time": self.wall_time,
+            "median_cpu_time": self.cpu_time,
+            "max_peak_rss_mb": self.peak_rss,
+            "wall_time_stdev": statistics.stdev(self.wall_times) if len(self.wall_times) > 1 else 0.0
+        }
+
+
+def discover_solutions(base_dir: Path = BASE_DIR, pattern: str = "day*/solution_*.py") -> list[Path]:
+    """Every solution file in the day directories, in day order."""
+    def order(path: Path) -> tuple:
+        described = describe_path(path.resolve())
+        return described["day"] or 0, described["part"] or 0, path.name
+    return sorted(base_dir.glob(pattern), key=order)
+
+
+def benchmark_solution(solution_path: Path,
+                       runs: int = DEFAULT_RUNS,
+                       warmup: int = DEFAULT_WARMUP,
+                       timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                       label: Optional[str] = None) -> BenchmarkResult:
+    """
+    Time a solution over repeated runs, each in a fresh interpreter so runs don't share state.
+
+    Warmup runs (which pay for compiling to .pyc and a cold page cache) aren't recorded. A
+    run that times out or crashes ends the benchmark of that solution early, as repeating
+    it would only say the same thing again.
+
+    Args:
+        solution_path: The solution to run (from its own directory, like any other run)
+        runs: Recorded runs
+        warmup: Unrecorded runs before them
+        timeout: Wall-clock limit per run in seconds
+        label: Name to record the result under (defaults to the path relative to src)
+    """
+    solution_path = solution_path.resolve()
+    described = describe_path(solution_path)
+    result = BenchmarkResult(
+        solution=label or (str(solution_path.relative_to(BASE_DIR)) if solution_path.is_relative_to(BASE_DIR)
+                           else str(solution_path)),
+        day=described["day"],
+        part=described["part"]
+    )
+    for run in range(warmup + runs):
+        execution = run_solution(solution_path, timeout=timeout, cpu_time_limit=timeout, profile_seconds=None)
+        if execution.too_slow or execution.returncode != 0:
+            result.timed_out = execution.too_slow
+            result.failed = not execution.too_slow
+            # Keep the one measurement, it's still a lower bound worth showing
+            if not result.wall_times:
+                result.wall_times.append(execution.duration)
+                result.cpu_times.append(execution.cpu_time)
+                result.peak_rss_mb.append(execution.peak_memory_mb)
+            break
+        if run >= warmup:
+            result.wall_times.append(execution.duration)
+            result.cpu_times.append(execution.cpu_time)
+            result.peak_rss_mb.append(execution.peak_memory_mb)
+    return result
+
+
+def save_baseline(results: list[BenchmarkResult], path: Path = DEFAULT_BASELINE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({
+            "created": time.time(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": {result.solution: result.summary() for result in results}
+        }, f, indent=2)
+
+
+def load_baseline(path: Path = DEFAULT_BASELINE_PATH) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)["results"]
+
+
+def regressions(result: BenchmarkResult, baseline: Optional[dict], tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """What got worse than the baseline by more than the tolerance (a fraction, 0.2 = 20%)."""
+    if baseline is None:
+        return []
+    flags = []
+    if result.timed_out and not baseline["timed_out"]:
+        flags.append("now times out")
+    elif result.failed and not baseline["failed"]:
+        flags.append("now fails")
+    elif not result.timed_out and not result.failed:
+        before = baseline["median_wall_time"]
+        if result.wall_time > before * (1 + tolerance) and result.wall_time - before > NOISE_FLOOR_SECONDS:
+            flags.append(f"wall +{result.wall_time / before - 1:.0%}")
+        before = baseline["median_cpu_time"]
+        if result.cpu_time > before * (1 + tolerance) and result.cpu_time - before > NOISE_FLOOR_SECONDS:
+            flags.append(f"cpu +{result.cpu_time / before - 1:.0%}")
+    if result.peak_rss > baseline["max_peak_rss_mb"] * (1 + tolerance):
+        flags.append(f"rss +{result.peak_rss / baseline['max_peak_rss_mb'] - 1:.0%}")
+    return flags
+
+
+def format_report(results: list[BenchmarkResult],
+                  baseline: dict[str, dict],
+                  tolerance: float = DEFAULT_TOLERANCE,
+                  sort: str = "day") -> str:
+    """
+    A table of every result against the baseline.
+
+    Args:
+        sort: "day" for day and part order, "speed" for slowest first
+    """
+    if sort == "speed":
+        # Timeouts are the slowest of all, whatever their single measurement says
+        results = sorted(results, key=lambda result: (not result.timed_out, -result.wall_time))
+    else:
+        results = sorted(results, key=lambda result: (result.day or 0, result.part or 0, result.solution))
+
+    header = (f"{'Day':<5}{'Part':<6}{'Solution':<46}{'Wall':>10}{'Stdev':>9}{'CPU':>10}{'Peak MB':>9}"
+              f"{'Baseline':>10}{'Change':>8}  Flags")
+    lines = [header, "-" * len(header)]
+    for result in results:
+        before = baseline.get(result.solution)
+        stdev = statistics.stdev(result.wall_times) if len(result.wall_times) > 1 else 0.0
+        wall = f"{result.wall_time:.3f}s" + ("+" if result.timed_out else "")
+        if before and before["median_wall_time"] and not result.timed_out and not result.failed:
+            change = f"{result.wall_time / before['median_wall_time'] - 1:+.0%}"
+        else:
+            change = "-"
+        flags = regressions(result, before, tolerance)
+        if result.timed_out:
+            flags.insert(0, "timeout")
+        elif result.failed:
+            flags.insert(0, "failed")
+        if before is None:
+            flags.append("new")
+        lines.append(f"{result.day or '-':<5}{result.part or '-':<6}{result.solution[-45:]:<46}{wall:>10}"
+                     f"{stdev:>8.3f}s{result.cpu_time:>9.3f}s{result.peak_rss:>9.0f}"
+                     f"{before['median_wall_time'] if before else 0:>9.3f}s{change:>8}  {', '.join(flags)}")
+
+    lines.append("-" * len(header))
+    regressed = [result for result in results if regressions(result, baseline.get(result.solution), tolerance)]
+    lines.append(f"{len(results)} solutions, {len(regressed)} regressed beyond {tolerance:.0%} "
+                 f"(timeouts shown as a lower bound with +)")
+    return "\n".join(lines)
+
+
+@dataclass
+class ScalingPoint:
+    """A solution's benchmark on one generated input."""
+    size: int
+    input_bytes: int
+    result: BenchmarkResult
+
+
+def launch_overhead(runs: int = DEFAULT_RUNS) -> float:
+    """Median wall time of a solution that does nothing, i.e. what starting the interpreter costs."""
+    with tempfile.TemporaryDirectory(prefix="aoc_scaling_") as scratch:
+        empty_solution = Path(scratch) / "solution_empty.py"
+        empty_solution.write_text("pass\n")
+        return benchmark_solution(empty_solution, runs, warmup=1, label="(empty script)").wall_time
+
+
+def scaling_benchmark(solution_paths: list[Path],
+                      day: int,
+                      sizes: Optional[list[int]] = None,
+                      seed: int = 0,
+                      runs: int = DEFAULT_SCALING_RUNS,
+                      warmup: int = 0,
+                      timeout: float = DEFAULT_TIMEOUT_SECONDS) -> dict[Path, list[ScalingPoint]]:
+    """
+    Benchmark solutions on generated inputs of increasing size.
+
+    Each input is generated once and the solutions are copied next to it in a scratch day
+    directory, like example runs. A solution that times out or fails at one size isn't run
+    at the bigger ones.
+
+    Args:
+        solution_paths: Solutions of the same day
+        day: The day, which picks the input generator
+        sizes: Input sizes (defaults to the generator's), see `aoc_input_generators.GENERATORS`
+        seed: Seed for the generated inputs
+        runs: Recorded runs per solution and size
+        warmup: Unrecorded runs before them
+        timeout: Wall-clock limit per run in seconds
+
+    Returns:
+        The points measured for each solution, smallest size first
+    """
+    sizes = sorted(sizes or GENERATORS[day].sizes)
+    points: dict[Path, list[ScalingPoint]] = {path: [] for path in solution_paths}
+    for size in sizes:
+        running = [path for path in solution_paths
+                   if not points[path] or not (points[path][-1].result.timed_out or points[path][-1].result.failed)]
+        if not running:
+            break
+        with tempfile.TemporaryDirectory(prefix="aoc_scaling_") as scratch:
+            day_dir = Path(scratch) / f"day{day}"
+            (day_dir / "input").mkdir(parents=True)
+            input_text = generate_input(day, size, seed)
+            (day_dir / "input" / "input.txt").write_text(input_text)
+            print(f"day{day} {GENERATORS[day].size_means} = {size} ({len(input_text) / 1024:.0f} KB)", flush=True)
+            for path in running:
+                scratch_solution = day_dir / path.name
+                shutil.copy(path, scratch_solution)
+                result = benchmark_solution(scratch_solution, runs, warmup, timeout, label=str(path))
+                points[path].append(ScalingPoint(size, len(input_text.encode()), result))
+    return points
+
+
+def complexity_exponent(points: list[ScalingPoint], overhead: float = 0.0) -> Optional[float]:
+    """
+    Estimate k in runtime ~ n^k from the slope of log(runtime) against log(input size).
+
+    The launch overhead is taken off first, and points that finish within the noise floor
+    of it are left out, as they only measure interpreter startup. Timeouts and failures
+    are left out too. A solution that isn't polynomial (day7's operator search) shows up as
+    an exponent that keeps growing with the sizes it's measured at.
+
+    Returns:
+        The exponent, or None with fewer than two usable points
+    """
+    usable = [(math.log(point.input_bytes), math.log(point.result.wall_time - overhead)) for point in points
+              if not point.result.timed_out and not point.result.failed
+              and point.result.wall_time - overhead > NOISE_FLOOR_SECONDS]
+    if len(usable) < 2:
+        return None
+    mean_x = statistics.mean(x for x, _ in usable)
+    mean_y = statistics.mean(y for _, y in usable)
+    spread = sum((x - mean_x) ** 2 for x, _ in usable)
+    if not spread:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in usable) / spread
+
+
+def format_scaling_report(points: dict[Path, list[ScalingPoint]], day: int, overhead: float = 0.0) -> str:
+    """A table of runtime against input size per solution, with the slope between sizes and overall."""
+    header = (f"{GENERATORS[day].size_means.capitalize():<24}{'Input KB':>10}{'Wall':>11}{'CPU':>10}{'Peak MB':>9}"
+              f"{'Slope':>8}")
+    lines = []
+    for path, solution_points in points.items():
+        name = path.relative_to(BASE_DIR) if path.is_relative_to(BASE_DIR) else path
+        lines.extend([f"{name}", header, "-" * len(header)])
+        previous = None
+        for point in solution_points:
+            result = point.result
+            wall = f"{result.wall_time:.3f}s" + ("+" if result.timed_out else "")
+            slope = "-"
+            if previous and not result.timed_out and not result.failed:
+                local = complexity_exponent([previous, point], overhead)
+                slope = f"{local:.2f}" if local is not None else "-"
+            status = "  timeout" if result.timed_out else "  failed" if result.failed else ""
+            lines.append(f"{point.size:<24}{point.input_bytes / 1024:>10.0f}{wall:>11}{result.cpu_time:>9.3f}s"
+                         f"{result.peak_rss:>9.0f}{slope:>8}{status}")
+            previous = point
+        exponent = complexity_exponent(solution_points, overhead)
+        lines.append("-" * len(header))
+        lines.append(f"runtime ~ n^{exponent:.2f} in input size n" if exponent is not None
+                     else "not enough sizes above the launch overhead to estimate the complexity")
+        lines.append("")
+    lines.append(f"Launch overhead of {overhead * 1000:.0f}ms taken off before fitting")
+    return "\n".join(lines)
+
+
+def save_scaling_csv(points: dict[Path, list[ScalingPoint]], path: Path):
+    """Write one row per solution and size, for plotting."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["solution", "size", "input_bytes", "wall_time", "cpu_time", "peak_rss_mb", "timed_out",
+                         "failed"])
+        for solution_path, solution_points in points.items():
+            for point in solution_points:
+                result = point.result
+                writer.writerow([solution_path, point.size, point.input_bytes, result.wall_time, result.cpu_time,
+                                 result.peak_rss, result.timed_out, result.failed])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every day's solutions against a stored baseline")
+    parser.add_argument("solutions", nargs="*", type=Path, help="Solution files (defaults to every dayN/solution_*.py)")
+    parser.add_argument("--days", type=int, nargs="+", help="Only benchmark these days")
+    parser.add_argument("--runs", type=int,
+                        help=f"Recorded runs per solution (default {DEFAULT_RUNS}, {DEFAULT_SCALING_RUNS} with --scale)")
+    parser.add_argument("--warmup", type=int, help=f"Unrecorded runs first (default {DEFAULT_WARMUP}, 0 with --scale)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SECONDS, help="Seconds per run")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Slowdown that counts as a regression, as a fraction (0.2 = 20%%)")
+    parser.add_argument("--sort", choices=["day", "speed"], default="day")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--scale", action="store_true",
+                        help="Run on generated inputs of increasing size instead and estimate the complexity")
+    parser.add_argument("--sizes", type=int, nargs="+", help="Input sizes for --scale (defaults to the day's)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the --scale inputs")
+    parser.add_argument("--csv", type=Path, help="Write the --scale measurements to this CSV file")
+    args = parser.parse_args()
+
+    solutions = [path.resolve() for path in args.solutions] or discover_solutions()
+    if args.days:
+        solutions = [path for path in solutions if describe_path(path.resolve())["day"] in args.days]
+
+    if args.scale:
+        overhead = launch_overhead()
+        all_points = {}
+        for day in sorted({describe_path(path)["day"] for path in solutions}):
+            if day not in GENERATORS:
+                print(f"No input generator for day {day}, skipping it")
+                continue
+            day_solutions = [path for path in solutions if describe_path(path)["day"] == day]
+            points = scaling_benchmark(day_solutions, day, args.sizes, args.seed, args.runs or DEFAULT_SCALING_RUNS,
+                                       args.warmup or 0, args.timeout)
+            print()
+            print(format_scaling_report(points, day, overhead))
+            all_points.update(points)
+        if args.csv:
+            save_scaling_csv(all_points, args.csv)
+            print(f"\nWrote the measurements to {args.csv}")
+        sys.exit(0)
+
+    results = []
+    for i, solution_path in enumerate(solutions, 1):
+        name = solution_path.relative_to(BASE_DIR) if solution_path.is_relative_to(BASE_DIR) else solution_path
+        print(f"[{i}/{len(solutions)}] {name}", flush=True)
+        results.append(benchmark_solution(solution_path, args.runs or DEFAULT_RUNS,
+                                          DEFAULT_WARMUP if args.warmup is None else args.warmup, args.timeout))
+
+    baseline = load_baseline(args.baseline)
+    print()
+    print(format_report(results, baseline, args.tolerance, args.sort))
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"\nSaved as the baseline in {args.baseline}")
+    elif any(regressions(result, baseline.get(result.solution), args.tolerance) for result in results):
+        sys.exit(1)
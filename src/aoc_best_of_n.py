@@ -0,0 +1,225 @@
+import argparse
+import asyncio
+import json
+import shutil
+import statistics
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from aoc_attempt_index import AttemptIndex
+from aoc_dedup import fingerprint
+from aoc_examples import check_examples, load_examples
+from aoc_executor import load_expected_answer, run_solution
+from aoc_llm_cache import LLMResponseCache
+from aoc_llm_solver import AoCLLMSolver, ModelProvider
+from aoc_worker_pool import get_worker_pool
+
+BASE_DIR = Path(__file__).parent.resolve()
+
+
+@dataclass
+class RuntimeProfile:
+    """Run times of a correct candidate over repeated runs."""
+    solution: str
+    durations: list[float] = field(default_factory=list)
+    cpu_times: list[float] = field(default_factory=list)
+    peak_memory_mb: float = 0.0
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.durations)
+
+    def summary(self) -> dict:
+        return {
+            **asdict(self),
+            "runs": len(self.durations),
+            "min": min(self.durations),
+            "median": self.median,
+            "mean": statistics.mean(self.durations),
+            "max": max(self.durations),
+            "stdev": statistics.stdev(self.durations) if len(self.durations) > 1 else 0.0
+        }
+
+
+def runtimes_path(solution_path: Path) -> Path:
+    """Where the runtime distribution of a solution is saved, e.g. solution_part2_try3.runtimes.json."""
+    return solution_path.with_suffix(".runtimes.json")
+
+
+def save_runtimes(solution_path: Path, profile: RuntimeProfile, **extra):
+    with open(runtimes_path(solution_path), "w") as f:
+        json.dump({**profile.summary(), **extra}, f, indent=2)
+
+
+def benchmark_candidates(solution_paths: list[Path], expected_answer: str, runs: int = 5) -> dict[Path, RuntimeProfile]:
+    """
+    Time each correct candidate over repeated runs on the warm worker pool.
+
+    The candidates take turns rather than running back to back, so a noisy moment on the
+    machine is spread across all of them instead of penalising one. A candidate that stops
+    printing the right answer on a re-run is dropped.
+
+    Returns:
+        The runtime profile of every candidate that stayed correct
+    """
+    profiles = {path: RuntimeProfile(str(path)) for path in solution_paths}
+    for _ in range(runs):
+        for path in list(profiles):
+            result = run_solution(path, expected_answer, profile_seconds=None, pool=get_worker_pool())
+            if not result.correct:
+                print(f"\n{path.name} failed on a re-run, dropping it: {result.feedback()}")
+                del profiles[path]
+                continue
+            profiles[path].durations.append(result.duration)
+            profiles[path].cpu_times.append(result.cpu_time)
+            profiles[path].peak_memory_mb = max(profiles[path].peak_memory_mb, result.peak_memory_mb)
+    return profiles
+
+
+async def solve_best_of_n(
+        day: int,
+        part: int,
+        models: list[tuple[ModelProvider, str]],
+        candidates_per_model: int = 4,
+        part1_solution_path: Optional[Path] = None,
+        runs: int = 5,
+        cache: Optional[LLMResponseCache] = None
+) -> Optional[Path]:
+    """
+    Generate several candidates, benchmark the correct ones and promote the fastest.
+
+    Unlike `solve_puzzle_async` this doesn't stop at the first correct candidate: every
+    candidate is generated and verified, the correct ones are timed over repeated runs and
+    the fastest (by median) is copied to the canonical solution_partN.py. An existing
+    solution_partN.py competes too, so it's only replaced by something faster. Each timed
+    candidate gets its runtime distribution saved next to it as <name>.runtimes.json.
+
+    Args:
+        day: Day number of the puzzle (needs input/answer_partN.txt)
+        part: Part number of the puzzle (1 or 2)
+        models: (provider, model_name) pairs to request candidates from
+        candidates_per_model: Number of candidates to generate per model
+        part1_solution_path: Optional path to part 1 solution file (required for part 2)
+        runs: How many times each correct candidate is timed
+        cache: Optional response cache shared by every candidate
+
+    Returns:
+        The path of the canonical solution, or None if no candidate was correct
+    """
+    if part not in [1, 2]:
+        raise ValueError("Part must be either 1 or 2")
+    if part == 2 and not part1_solution_path:
+        raise ValueError("Part 1 solution path is required when solving part 2")
+
+    day_dir = BASE_DIR / f"day{day}"
+    expected_answer = load_expected_answer(day_dir, part)
+    if expected_answer is None:
+        raise ValueError(f"Best-of-N needs a stored answer for day {day} part {part} (input/answer_part{part}.txt)")
+    examples = load_examples(day_dir, part)
+    attempt_index = AttemptIndex()
+
+    solvers = [
+        AoCLLMSolver(
+            day=day,
+            part=part,
+            provider=provider,
+            model_name=model_name,
+            part1_solution_path=part1_solution_path,
+            cache=cache,
+            attempt_index=attempt_index
+        )
+        for provider, model_name in models
+    ]
+
+    async def generate(solver: AoCLLMSolver, attempt_number: int, variant: int) -> Path:
+        solution = await solver.agenerate_solution(attempt_number, variant)
+        return solver.save_solution(solution, attempt_number)
+
+    tasks = []
+    for solver in solvers:
+        # Number after the tries already on disk, so earlier runs' candidates aren't overwritten
+        first_attempt = solver.last_saved_attempt() + 1
+        for i in range(candidates_per_model):
+            tasks.append(generate(solver, first_attempt + i, i))
+        solver.attempt_number = first_attempt + candidates_per_model - 1
+
+    candidates = []
+    seen_solutions: set[str] = set()
+    for outcome in await asyncio.gather(*tasks, return_exceptions=True):
+        if isinstance(outcome, Exception):
+            print(f"Candidate failed: {outcome}")
+            continue
+        solution_fingerprint = fingerprint(outcome.read_text(encoding="utf-8"))
+        if solution_fingerprint in seen_solutions:
+            print(f"\n{outcome.name} is identical to an earlier candidate, skipping it")
+            continue
+        seen_solutions.add(solution_fingerprint)
+        candidates.append(outcome)
+
+    async def verify(solution_path: Path) -> bool:
+        if await asyncio.to_thread(check_examples, solution_path, examples) is not None:
+            print(f"\n{solution_path.name} failed the examples")
+            return False
+        result = await asyncio.to_thread(run_solution, solution_path, expected_answer,
+                                         index=attempt_index, pool=get_worker_pool())
+        print(f"\n{solution_path.name} ran in {result.duration:.2f}s and printed: {result.answers}")
+        return bool(result.correct)
+
+    verified = await asyncio.gather(*(verify(path) for path in candidates))
+    correct = [path for path, ok in zip(candidates, verified) if ok]
+
+    canonical_path = day_dir / f"solution_part{part}.py"
+    if canonical_path.exists():
+        # The current canonical solution has to be beaten, not just matched (the ranking sort keeps ties in order)
+        if await verify(canonical_path):
+            correct.insert(0, canonical_path)
+    if not correct:
+        print(f"\nNone of the {len(candidates)} candidates for day {day} part {part} were correct")
+        return None
+
+    print(f"\nTiming {len(correct)} correct solution(s) over {runs} runs each")
+    profiles = await asyncio.to_thread(benchmark_candidates, correct, expected_answer, runs)
+    if not profiles:
+        print(f"\nNo solution for day {day} part {part} stayed correct over repeated runs")
+        return None
+    for path, profile in profiles.items():
+        save_runtimes(path, profile)
+
+    ranked = sorted(profiles.items(), key=lambda item: item[1].median)
+    print(f"\n{'Solution':<46}{'Median':>10}{'Min':>10}{'Max':>10}{'Peak MB':>9}")
+    for path, profile in ranked:
+        print(f"{path.name:<46}{profile.median:>9.3f}s{min(profile.durations):>9.3f}s"
+              f"{max(profile.durations):>9.3f}s{profile.peak_memory_mb:>9.0f}")
+
+    fastest, profile = ranked[0]
+    if fastest == canonical_path:
+        print(f"\nKeeping {canonical_path.name}, none of the candidates beat it")
+        return canonical_path
+
+    shutil.copyfile(fastest, canonical_path)
+    attempt_index.record_saved(canonical_path, canonical_path.read_text(encoding="utf-8"), day, part)
+    save_runtimes(canonical_path, profile, promoted_from=fastest.name)
+    print(f"\nPromoted {fastest.name} ({profile.median:.3f}s median) to {canonical_path.name}")
+    return canonical_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate several candidates and keep the fastest correct one")
+    parser.add_argument("day", type=int)
+    parser.add_argument("part", type=int, choices=[1, 2])
+    parser.add_argument("--part1", type=Path, help="Part 1 solution file (required for part 2)")
+    parser.add_argument("--provider", type=ModelProvider, default=ModelProvider.OPENAI)
+    parser.add_argument("--model", default="gpt-4o")
+    parser.add_argument("--candidates", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(solve_best_of_n(
+        day=args.day,
+        part=args.part,
+        models=[(args.provider, args.model)],
+        candidates_per_model=args.candidates,
+        part1_solution_path=args.part1,
+        runs=args.runs
+    ))
@@ -0,0 +1,219 @@
+import asyncio
+import threading
+import time
+import weakref
+from functools import cache
+from typing import Any, Callable, Optional
+
+import httpx
+
+# Bounds for each shared pool; batch runs never need more than a handful of concurrent calls per model
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY_SECONDS = 60.0
+REQUEST_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+CONNECT_EVENTS = ("connection.connect_tcp", "connection.start_tls")
+
+
+class ClientMetrics:
+    """Connection reuse and latency of the calls made through one shared client."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+        self.connect_time = 0.0
+        self.new_connection_latency = 0.0
+        self.reused_connection_latency = 0.0
+
+    def record(self, connect_time: Optional[float], latency: float):
+        with self._lock:
+            self.requests += 1
+            if connect_time is None:
+                self.reused_connection_latency += latency
+            else:
+                self.connections_opened += 1
+                self.connect_time += connect_time
+                self.new_connection_latency += latency
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            reused = self.requests - self.connections_opened
+            average_connect_time = self.connect_time / self.connections_opened if self.connections_opened else 0.0
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "reused": reused,
+                "reuse_rate": reused / self.requests if self.requests else 0.0,
+                "average_connect_time": average_connect_time,
+                # Every reused connection skipped a TCP + TLS handshake
+                "latency_saved": reused * average_connect_time,
+                "average_new_connection_latency":
+                    self.new_connection_latency / self.connections_opened if self.connections_opened else 0.0,
+                "average_reused_connection_latency": self.reused_connection_latency / reused if reused else 0.0
+            }
+
+
+class _RequestTrace:
+    """Times the connection setup of a single request from httpcore's trace events."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.connect_time: Optional[float] = None
+        self._started: dict[str, float] = {}
+
+    def __call__(self, event: str, info: dict):
+        name, _, stage = event.rpartition(".")
+        if name not in CONNECT_EVENTS:
+            return
+        if stage == "started":
+            self._started[name] = time.perf_counter()
+        elif stage == "complete" and name in self._started:
+            self.connect_time = (self.connect_time or 0.0) + time.perf_counter() - self._started.pop(name)
+
+    async def atrace(self, event: str, info: dict):
+        self(event, info)
+
+
+class LoopLocalTransport(httpx.AsyncBaseTransport):
+    """
+    Async transport with one connection pool per event loop.
+
+    Async connections belong to the loop that opened them, so sharing a single pool
+    breaks as soon as a second asyncio.run() reuses it; each loop gets its own instead.
+    """
+
+    def __init__(self, limits: httpx.Limits):
+        self.limits = limits
+        self._transports: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _transport(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._transports:
+                self._transports[loop] = httpx.AsyncHTTPTransport(limits=self.limits)
+            return self._transports[loop]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport().handle_async_request(request)
+
+    async def aclose(self):
+        with self._lock:
+            transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+
+class SharedClients:
+    """A bounded sync and async HTTP client pair shared by every call to one provider and model."""
+
+    def __init__(self,
+                 max_connections: int = MAX_CONNECTIONS,
+                 max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS):
+        limits = httpx.Limits(max_connections=max_connections,
+                              max_keepalive_connections=max_keepalive_connections,
+                              keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS)
+        self.metrics = ClientMetrics()
+        # httpx.Client is thread-safe, so one client serves every thread
+        self.http_client = httpx.Client(
+            limits=limits,
+            timeout=REQUEST_TIMEOUT,
+            event_hooks={"request": [self._start_trace], "response": [self._finish_trace]}
+        )
+        self.http_async_client = httpx.AsyncClient(
+            transport=LoopLocalTransport(limits),
+            timeout=REQUEST_TIMEOUT,
+            event_hooks={"request": [self._astart_trace], "response": [self._afinish_trace]}
+        )
+
+    def _start_trace(self, request: httpx.Request):
+        trace = _RequestTrace()
+        request.extensions["trace"] = trace
+        request.extensions["aoc_trace"] = trace
+
+    def _finish_trace(self, response: httpx.Response):
+        # Called once the response headers arrive, so this is the latency before the first byte
+        trace = response.request.extensions.get("aoc_trace")
+        if trace is not None:
+            self.metrics.record(trace.connect_time, time.perf_counter() - trace.start)
+
+    async def _astart_trace(self, request: httpx.Request):
+        trace = _RequestTrace()
+        request.extensions["trace"] = trace.atrace
+        request.extensions["aoc_trace"] = trace
+
+    async def _afinish_trace(self, response: httpx.Response):
+        self._finish_trace(response)
+
+
+_clients: dict[tuple[str, str], SharedClients] = {}
+_llms: dict[tuple[str, str], Any] = {}
+_registry_lock = threading.Lock()
+
+
+def get_shared_clients(provider: str, model_name: str) -> SharedClients:
+    """The process-wide HTTP clients for a provider and model."""
+    with _registry_lock:
+        if (provider, model_name) not in _clients:
+            _clients[(provider, model_name)] = SharedClients()
+        return _clients[(provider, model_name)]
+
+
+def get_shared_llm(provider: str, model_name: str, create: Callable[[SharedClients], Any]) -> Any:
+    """
+    The process-wide chat model for a provider and model, created on first use.
+
+    Args:
+        provider: Provider name, e.g. "openai"
+        model_name: Model name, e.g. "gpt-4o"
+        create: Builds the chat model on top of the shared clients
+    """
+    clients = get_shared_clients(provider, model_name)
+    with _registry_lock:
+        if (provider, model_name) not in _llms:
+            _llms[(provider, model_name)] = create(clients)
+        return _llms[(provider, model_name)]
+
+
+@cache
+def pooled_chat_anthropic_class():
+    """ChatAnthropic always builds its own HTTP clients, so this subclass uses the shared ones instead."""
+    from functools import cached_property
+
+    import anthropic
+    from langchain_anthropic import ChatAnthropic
+    from pydantic import Field
+
+    class PooledChatAnthropic(ChatAnthropic):
+        shared_clients: Any = Field(default=None, exclude=True)
+
+        @cached_property
+        def _client(self) -> anthropic.Client:
+            return anthropic.Client(**self._client_params, http_client=self.shared_clients.http_client)
+
+        @cached_property
+        def _async_client(self) -> anthropic.AsyncClient:
+            return anthropic.AsyncClient(**self._client_params, http_client=self.shared_clients.http_async_client)
+
+    return PooledChatAnthropic
+
+
+def format_client_pool_metrics() -> str:
+    """Summarise connection reuse for every shared client."""
+    with _registry_lock:
+        clients = dict(_clients)
+
+    lines = []
+    for (provider, model_name), shared in sorted(clients.items()):
+        metrics = shared.metrics.snapshot()
+        if not metrics["requests"]:
+            continue
+        lines.append(f"{provider} {model_name}: {metrics['requests']} requests over "
+                     f"{metrics['connections_opened']} connections ({metrics['reuse_rate']:.0%} reused), "
+                     f"average handshake {metrics['average_connect_time'] * 1000:.0f}ms, "
+                     f"~{metrics['latency_saved']:.2f}s saved, time to headers "
+                     f"{metrics['average_new_connection_latency']:.2f}s new vs "
+                     f"{metrics['average_reused_connection_latency']:.2f}s reused")
+    return "\n".join(lines)
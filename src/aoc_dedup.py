@@ -0,0 +1,122 @@
+import ast
+import builtins
+import hashlib
+import sys
+from pathlib import Path
+from typing import Optional
+
+BUILTIN_NAMES = frozenset(dir(builtins))
+
+
+class _Canonicalizer(ast.NodeTransformer):
+    """Renames every user-defined identifier to v0, v1, ... in order of first appearance."""
+
+    def __init__(self, bound_names: frozenset[str] = frozenset()):
+        self.names: dict[str, str] = {}
+        # Names the program itself binds, so keyword arguments naming them are renamed too
+        self.bound_names = bound_names
+
+    def canonical(self, name: str) -> str:
+        # Builtins keep their names, otherwise swapping min for max would look like a duplicate
+        if name in BUILTIN_NAMES:
+            return name
+        if name not in self.names:
+            self.names[name] = f"v{len(self.names)}"
+        return self.names[name]
+
+    def visit_Name(self, node: ast.Name) -> ast.Name:
+        node.id = self.canonical(node.id)
+        return node
+
+    def visit_arg(self, node: ast.arg) -> ast.arg:
+        node.arg = self.canonical(node.arg)
+        node.annotation = None
+        return node
+
+    def visit_keyword(self, node: ast.keyword) -> ast.keyword:
+        # f(b=4) must follow f's parameter b when it's renamed, but sorted(key=...) keeps its keyword
+        if node.arg in self.bound_names:
+            node.arg = self.canonical(node.arg)
+        return self.generic_visit(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.FunctionDef:
+        node.name = self.canonical(node.name)
+        return self.generic_visit(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> ast.ClassDef:
+        node.name = self.canonical(node.name)
+        return self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> ast.AnnAssign:
+        # The hint itself doesn't matter, but the statement does: `x: int` declares a dataclass field
+        node.annotation = ast.Constant("annotation")
+        return self.generic_visit(node)
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        node = super().generic_visit(node)
+        if hasattr(node, "returns"):
+            node.returns = None
+        if isinstance(node, (ast.Module, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            node.body = _strip_docstring(node.body)
+        return node
+
+
+def _strip_docstring(body: list[ast.stmt]) -> list[ast.stmt]:
+    if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+            and isinstance(body[0].value.value, str):
+        body = body[1:]
+    return body or [ast.Pass()]
+
+
+def normalize(source: str) -> Optional[str]:
+    """
+    Reduce a solution to its structure: comments, docstrings, type hints, formatting and
+    identifier names are all dropped, so two programs that only differ in those normalize
+    to the same text.
+
+    Returns:
+        The normalized AST dump, or None if the source doesn't parse
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+    bound_names = frozenset(node.arg if isinstance(node, ast.arg) else node.id for node in ast.walk(tree)
+                            if isinstance(node, ast.arg) or isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store))
+    tree = _Canonicalizer(bound_names).visit(tree)
+    return ast.dump(tree, annotate_fields=False, include_attributes=False)
+
+
+def fingerprint(source: str) -> str:
+    """Hash of the normalized solution (of the whitespace-stripped text if it doesn't parse)."""
+    normalized = normalize(source)
+    if normalized is None:
+        normalized = "\n".join(line.rstrip() for line in source.strip().splitlines())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def duplicate_feedback(attempt_number: int, answers: Optional[list[str]], feedback: str) -> str:
+    """Feedback for an attempt that is identical to an earlier one."""
+    if answers:
+        outcome = f"which printed {', '.join(answers[-2:])}"
+    else:
+        outcome = "which didn't work"
+    return (f"This solution is identical to attempt #{attempt_number} (only names, comments or formatting "
+            f"differ), {outcome}. The feedback on it was: {feedback}\n"
+            f"Don't repeat it - take a genuinely different approach.")
+
+
+if __name__ == "__main__":
+    # Group the solution files under a directory by fingerprint, e.g. python aoc_dedup.py day4
+    groups: dict[str, list[Path]] = {}
+    for solution_path in sorted(Path(sys.argv[1] if len(sys.argv) > 1 else ".").glob("**/solution_part*.py")):
+        groups.setdefault(fingerprint(solution_path.read_text(encoding="utf-8", errors="replace")), []).append(solution_path)
+
+    duplicates = [paths for paths in groups.values() if len(paths) > 1]
+    for paths in duplicates:
+        print("Identical:")
+        for path in paths:
+            print(f"  {path}")
+    print(f"{sum(len(paths) for paths in groups.values())} files, {len(groups)} distinct solutions")
@@ -0,0 +1,243 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from aoc_examples import split_blocks
+from aoc_input_sampler import estimate_tokens
+from aoc_ledger import CallLedger
+
+BASE_DIR = Path(__file__).parent.resolve()
+DEFAULT_CACHE_PATH = BASE_DIR / ".aoc" / "descriptions.json"
+
+PART_HEADING_PATTERN = re.compile(r"^--- Part Two ---$", re.MULTILINE)
+# Lines the site adds once part 1 is solved, e.g. "Your puzzle answer was 198089."
+SOLVED_STATUS_PATTERN = re.compile(r"^(Your puzzle answer was .*|The first half of this puzzle is complete!.*)$")
+# The first rule usually introduces the input, e.g. "The unusual data (your puzzle input) consists of..."
+RULES_START_PATTERN = re.compile(r"puzzle input|for example", re.IGNORECASE)
+
+
+@dataclass
+class DescriptionSection:
+    """One part of a puzzle description, split into what it's made of."""
+    heading: str
+    story: list[str] = field(default_factory=list)
+    rules: list[str] = field(default_factory=list)
+    examples: list[str] = field(default_factory=list)
+    question: str = ""
+    text: str = ""
+
+
+@dataclass
+class ParsedDescription:
+    """A description file parsed into its part 1 and (when present) part 2 sections."""
+    content_hash: str
+    text: str
+    sections: list[DescriptionSection]
+
+    @property
+    def new_text(self) -> str:
+        """
+        The text of the last part in the file, without the site's "Your puzzle answer was" lines.
+
+        Part 2 descriptions repeat all of part 1 before "--- Part Two ---", which the
+        prompt already has from the part 1 description.
+        """
+        return self.sections[-1].text
+
+
+def parse_section(text: str) -> DescriptionSection:
+    """Split one part's text into its heading, story, rules, examples and question."""
+    lines = [line for line in text.splitlines() if not SOLVED_STATUS_PATTERN.match(line.strip())]
+    text = "\n".join(lines).strip()
+    items = split_blocks(text)
+
+    section = DescriptionSection(heading="", text=text)
+    if items and items[0][0] == "prose" and items[0][1].startswith("---"):
+        section.heading = items.pop(0)[1]
+
+    question_index = max((i for i, (kind, line) in enumerate(items) if kind == "prose" and "?" in line), default=None)
+    if question_index is not None:
+        section.question = items[question_index][1]
+
+    # Part 1's story runs until the first line about the input or an example, part 2 only
+    # opens with a line or so of story before getting to the changed rules
+    story_paragraphs = 1 if section.heading == "--- Part Two ---" else None
+    in_story = True
+    for i, (kind, content) in enumerate(items):
+        if i == question_index:
+            continue
+        if kind == "block":
+            section.examples.append(content)
+            in_story = False
+            continue
+        if in_story and story_paragraphs is not None:
+            in_story = len(section.story) < story_paragraphs
+        elif in_story:
+            in_story = not RULES_START_PATTERN.search(content) and (i + 1 >= len(items) or items[i + 1][0] != "block")
+        (section.story if in_story else section.rules).append(content)
+    return section
+
+
+def parse_description(text: str, earlier_text: Optional[str] = None) -> ParsedDescription:
+    """
+    Parse a description into sections.
+
+    Args:
+        text: The description
+        earlier_text: The part 1 description, used to find the repeated part 1 text in a part 2
+            description that has no "--- Part Two ---" heading
+    """
+    content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    headings = list(PART_HEADING_PATTERN.finditer(text))
+    if headings:
+        chunks = [text[:headings[-1].start()], text[headings[-1].start():]]
+    elif earlier_text and text.startswith(earlier_text.rstrip()):
+        chunks = [earlier_text, text[len(earlier_text.rstrip()):]]
+    else:
+        chunks = [text]
+    sections = [parse_section(chunk) for chunk in chunks if chunk.strip()]
+    return ParsedDescription(content_hash, text, sections or [DescriptionSection(heading="")])
+
+
+class DescriptionCache:
+    """
+    Parsed descriptions keyed by the hash of the file, so each one is parsed once.
+
+    Files are only re-read when their size or modification time changes. Parsed results
+    are also kept in a JSON file, so other processes (batch runs, the report) reuse them.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        # Path -> (mtime, size, content hash)
+        self._stats: dict[Path, tuple[int, int, str]] = {}
+        self._parsed: dict[str, ParsedDescription] = {}
+        self.hits = 0
+        self.misses = 0
+        if path.exists():
+            with open(path, "r") as f:
+                for content_hash, parsed in json.load(f).items():
+                    sections = [DescriptionSection(**section) for section in parsed["sections"]]
+                    self._parsed[content_hash] = ParsedDescription(content_hash, parsed["text"], sections)
+
+    def _save(self):
+        # Written to a temporary file first, so a reader never sees half a cache
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({content_hash: asdict(parsed) for content_hash, parsed in self._parsed.items()}, f)
+        os.replace(tmp_path, self.path)
+
+    def load(self, description_path: Path) -> ParsedDescription:
+        """Parse a description file, or return the cached result if it hasn't changed."""
+        description_path = description_path.resolve()
+        stat = description_path.stat()
+        with self._lock:
+            known = self._stats.get(description_path)
+            if known and known[:2] == (stat.st_mtime_ns, stat.st_size) and known[2] in self._parsed:
+                self.hits += 1
+                return self._parsed[known[2]]
+
+        text = description_path.read_text()
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            self._stats[description_path] = (stat.st_mtime_ns, stat.st_size, content_hash)
+            if content_hash in self._parsed:
+                self.hits += 1
+                return self._parsed[content_hash]
+            self.misses += 1
+
+        earlier_path = description_path.with_name("description_part1.txt")
+        earlier_text = earlier_path.read_text() if earlier_path != description_path and earlier_path.exists() else None
+        parsed = parse_description(text, earlier_text)
+        with self._lock:
+            self._parsed[content_hash] = parsed
+            self._save()
+        return parsed
+
+
+_shared_cache: Optional[DescriptionCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_description_cache() -> DescriptionCache:
+    """The process-wide description cache."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = DescriptionCache()
+        return _shared_cache
+
+
+def seconds_per_prompt_token(ledger: CallLedger) -> dict[str, float]:
+    """How long each model has taken to first token per prompt token, from the calls in the ledger."""
+    totals: dict[str, list[float]] = {}
+    for record in ledger.records():
+        if record.prompt_tokens:
+            row = totals.setdefault(record.model, [0.0, 0.0])
+            row[0] += record.time_to_first_token
+            row[1] += record.prompt_tokens
+    return {model: seconds / tokens for model, (seconds, tokens) in totals.items() if tokens}
+
+
+def report(day_dirs: list[Path], ledger: Optional[CallLedger] = None) -> str:
+    """
+    Per day, how many prompt tokens dropping the repeated part 1 text saves on each part 2
+    call, and roughly how much time to first token that is for the models in the ledger.
+    """
+    latency = seconds_per_prompt_token(ledger or CallLedger())
+    header = f"{'Day':<5}{'Part 2 desc':>12}{'Deduped':>9}{'Saved':>7}{'':>6}{'Parse':>9}{'Cached':>9}  TTFT saved per call"
+    lines = [header, "-" * len(header)]
+    total_saved = 0
+    for day_dir in day_dirs:
+        description_path = day_dir / "input" / "description_part2.txt"
+        if not description_path.exists() or not description_path.read_text().strip():
+            continue
+        earlier_path = day_dir / "input" / "description_part1.txt"
+        start = time.perf_counter()
+        parsed = parse_description(description_path.read_text(),
+                                   earlier_path.read_text() if earlier_path.exists() else None)
+        parse_time = time.perf_counter() - start
+        get_description_cache().load(description_path)
+        start = time.perf_counter()
+        get_description_cache().load(description_path)
+        cached_time = time.perf_counter() - start
+
+        full = estimate_tokens(parsed.text)
+        deduped = estimate_tokens(parsed.new_text)
+        saved = full - deduped
+        total_saved += saved
+        ttft = ", ".join(f"{model} {saved * seconds * 1000:.0f}ms" for model, seconds in sorted(latency.items())) or "-"
+        lines.append(f"{day_dir.name[3:]:<5}{full:>12}{deduped:>9}{saved:>7}{saved / full if full else 0:>6.0%}"
+                     f"{parse_time * 1000:>7.2f}ms{cached_time * 1000:>7.3f}ms  {ttft}")
+    lines.append("-" * len(header))
+    lines.append(f"~{total_saved} prompt tokens saved per round of part 2 calls")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse puzzle descriptions and report what deduplication saves")
+    parser.add_argument("days", nargs="*", type=int, help="Days to report on (defaults to every day)")
+    parser.add_argument("--show", type=int, metavar="PART", help="Print the parsed sections of this part instead")
+    args = parser.parse_args()
+
+    day_dirs = [BASE_DIR / f"day{day}" for day in args.days] or sorted(
+        BASE_DIR.glob("day*"), key=lambda path: int(path.name[3:]))
+    if args.show:
+        for day_dir in day_dirs:
+            parsed = get_description_cache().load(day_dir / "input" / f"description_part{args.show}.txt")
+            for section in parsed.sections:
+                print(f"{day_dir.name} {section.heading or '(no heading)'}")
+                print(f"  story: {len(section.story)} paragraphs, rules: {len(section.rules)} paragraphs, "
+                      f"examples: {len(section.examples)} blocks")
+                print(f"  question: {section.question}")
+    else:
+        print(report(day_dirs))
@@ -0,0 +1,253 @@
+import argparse
+import json
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from aoc_executor import ExecutionResult, run_solution
+from aoc_worker_pool import get_worker_pool
+
+BASE_DIR = Path(__file__).parent.resolve()
+
+# Examples are tiny, so anything slower than this is stuck
+EXAMPLE_TIMEOUT_SECONDS = 10.0
+
+# Share of an example's characters that may be missing from the real input; annotated
+# diagrams (paths drawn with X, |, + and O) go well over this
+MAX_FOREIGN_CHARACTERS = 0.05
+
+# Lines that introduce an example input, e.g. "For example:" or "Here's the larger example from before:"
+EXAMPLE_INTRO_PATTERN = re.compile(r"for example|consider the following|(larger|longer|another|same) example", re.IGNORECASE)
+# Answer sentences that refer back to the first example of part 1
+ORIGINAL_EXAMPLE_PATTERN = re.compile(r"original example|example from before|same example|example above|above example",
+                                      re.IGNORECASE)
+LARGER_EXAMPLE_PATTERN = re.compile(r"(larger|longer) example", re.IGNORECASE)
+NUMBER_PATTERN = re.compile(r"-?\d+")
+PROSE_WORD_PATTERN = re.compile(r"[A-Za-z][a-z']+")
+
+
+@dataclass
+class Example:
+    """A worked example from a puzzle description."""
+    input: str
+    expected: str
+    # The sentence the expected answer was taken from, to make reviewing the fixture easy
+    source: str = ""
+
+
+def is_prose(line: str) -> bool:
+    """Whether a description line is a sentence rather than part of an example."""
+    if line.startswith("---"):
+        # Titles like "--- Day 5: Print Queue ---"
+        return True
+    words = len(PROSE_WORD_PATTERN.findall(line))
+    if " " not in line.strip():
+        return False
+    # Short intros like "For example:" count as prose too
+    return words >= 4 or (words >= 2 and line.rstrip().endswith(":"))
+
+
+def split_blocks(description: str) -> list[tuple[str, str]]:
+    """
+    Split a description into ("prose", line) and ("block", text) items, where a block is a
+    run of non-prose lines (blank lines included) such as an example input.
+    """
+    items = []
+    block: list[str] = []
+    for line in description.splitlines():
+        if is_prose(line):
+            if "".join(block).strip():
+                items.append(("block", "\n".join(block).strip("\n")))
+            block = []
+            items.append(("prose", line))
+        else:
+            block.append(line)
+    if "".join(block).strip():
+        items.append(("block", "\n".join(block).strip("\n")))
+    return items
+
+
+def example_inputs(items: list[tuple[str, str]], alphabet: set[str]) -> list[tuple[int, str]]:
+    """
+    Find the example inputs: blocks introduced by an example line that are made of the
+    characters the real input uses (which rules out annotated diagrams).
+    """
+    examples = []
+    for i, (kind, text) in enumerate(items):
+        if kind != "block" or i == 0 or items[i - 1][0] != "prose":
+            continue
+        intro = items[i - 1][1]
+        if i > 1 and items[i - 2][0] == "prose" and not EXAMPLE_INTRO_PATTERN.search(intro) \
+                and len(PROSE_WORD_PATTERN.findall(intro)) < 4:
+            # A short label between the intro and the example, e.g. "Initial arrangement:"
+            intro = items[i - 2][1]
+        characters = text.replace("\n", "")
+        foreign = sum(character not in alphabet for character in characters) / max(1, len(characters))
+        if intro.rstrip().endswith(":") and EXAMPLE_INTRO_PATTERN.search(intro) and foreign <= MAX_FOREIGN_CHARACTERS:
+            examples.append((i, text))
+    return examples
+
+
+def answer_sentence(items: list[tuple[str, str]]) -> Optional[tuple[int, str]]:
+    """The last sentence with a number before the final question, which states the example's answer."""
+    question = max((i for i, (kind, text) in enumerate(items) if kind == "prose" and "?" in text), default=len(items))
+    # Part 2 descriptions repeat part 1, whose answer sentence mustn't be picked up
+    part_start = max((i for i, (kind, text) in enumerate(items[:question]) if text.startswith("--- Part")), default=0)
+    for i in range(question - 1, part_start - 1, -1):
+        kind, text = items[i]
+        if kind != "prose":
+            continue
+        # Saved descriptions of solved puzzles include "Your puzzle answer was ..."
+        sentences = [sentence for sentence in re.split(r"(?<=[.!:?])\s+", text)
+                     if NUMBER_PATTERN.search(sentence) and not sentence.rstrip().endswith("?")
+                     and "puzzle answer was" not in sentence]
+        if sentences:
+            return i, sentences[-1]
+    return None
+
+
+def answer_from_sentence(sentence: str) -> Optional[str]:
+    # Workings are given in brackets, e.g. "produces 161 (2*4 + 5*5 + 11*8 + 8*5)"
+    without_workings = re.sub(r"\([^)]*\)", "", sentence)
+    numbers = NUMBER_PATTERN.findall(without_workings)
+    return numbers[-1] if numbers else None
+
+
+def extract_examples(description: str,
+                     puzzle_input: str,
+                     earlier_description: Optional[str] = None) -> list[Example]:
+    """
+    Pull the main worked example and its answer out of a puzzle description.
+
+    Args:
+        description: The description of the part being solved
+        puzzle_input: The real puzzle input, used to tell example inputs from annotated diagrams
+        earlier_description: The part 1 description when extracting part 2, whose examples
+            part 2 usually refers back to
+
+    Returns:
+        The examples found (empty if no confident match)
+    """
+    alphabet = set(puzzle_input) - {"\n"}
+    items = split_blocks(description)
+    found = answer_sentence(items)
+    if found is None:
+        return []
+    answer_index, sentence = found
+    expected = answer_from_sentence(sentence)
+    if expected is None:
+        return []
+
+    earlier = example_inputs(split_blocks(earlier_description), alphabet) if earlier_description else []
+    here = [(i, text) for i, text in example_inputs(items, alphabet) if i < answer_index]
+
+    if earlier and LARGER_EXAMPLE_PATTERN.search(sentence):
+        example_input = max((text for _, text in earlier + here), key=len)
+    elif earlier and (ORIGINAL_EXAMPLE_PATTERN.search(sentence) or not here):
+        example_input = earlier[0][1]
+    elif here:
+        example_input = here[-1][1]
+    else:
+        return []
+    return [Example(input=example_input + "\n", expected=expected, source=sentence.strip())]
+
+
+def examples_path(day_dir: Path, part: int) -> Path:
+    return day_dir / "input" / f"examples_part{part}.json"
+
+
+def save_examples(day_dir: Path, part: int, examples: list[Example]):
+    with open(examples_path(day_dir, part), "w") as f:
+        json.dump([asdict(example) for example in examples], f, indent=2)
+
+
+def load_examples(day_dir: Path, part: int, extract: bool = True) -> list[Example]:
+    """
+    Load the example fixtures for a day and part from input/examples_partN.json.
+
+    When there is no fixture file yet the examples are extracted from the description and
+    saved, so they can be reviewed and corrected by hand.
+    """
+    path = examples_path(day_dir, part)
+    if path.exists():
+        with open(path, "r") as f:
+            return [Example(**example) for example in json.load(f)]
+    if not extract:
+        return []
+
+    input_dir = day_dir / "input"
+    description_path = input_dir / f"description_part{part}.txt"
+    input_path = input_dir / "input.txt"
+    if not description_path.exists() or not input_path.exists():
+        return []
+    earlier_path = input_dir / "description_part1.txt"
+    examples = extract_examples(
+        description_path.read_text(),
+        input_path.read_text(),
+        earlier_path.read_text() if part == 2 and earlier_path.exists() else None
+    )
+    save_examples(day_dir, part, examples)
+    return examples
+
+
+def run_example(solution_path: Path, example: Example, timeout: float = EXAMPLE_TIMEOUT_SECONDS) -> ExecutionResult:
+    """Run a solution against an example input in a scratch copy of its day directory."""
+    with tempfile.TemporaryDirectory(prefix="aoc_example_") as scratch:
+        scratch_dir = Path(scratch)
+        (scratch_dir / "input").mkdir()
+        (scratch_dir / "input" / "input.txt").write_text(example.input)
+        scratch_solution = scratch_dir / solution_path.name
+        shutil.copy(solution_path, scratch_solution)
+        return run_solution(scratch_solution, example.expected, timeout=timeout, profile_seconds=None,
+                            pool=get_worker_pool())
+
+
+def check_examples(solution_path: Path, examples: list[Example]) -> Optional[str]:
+    """
+    Run a solution against every example in parallel.
+
+    Returns:
+        Feedback for the first failing example, or None if they all pass
+    """
+    if not examples:
+        return None
+
+    with ThreadPoolExecutor(max_workers=len(examples)) as pool:
+        results = list(pool.map(lambda example: run_example(solution_path, example), examples))
+
+    for example, result in zip(examples, results):
+        if result.correct:
+            continue
+        if result.returncode == 0 and not result.too_slow and result.stdout.strip():
+            last_line = result.stdout.strip().splitlines()[-1]
+            if example.expected in NUMBER_PATTERN.findall(result.stdout):
+                # The answer is only picked up as the last token of a line
+                outcome = (f"printed {last_line!r}, which contains the right answer {example.expected}, but the "
+                           f"answer has to be the last thing on its line")
+            else:
+                outcome = f"printed {last_line!r} but the expected answer is {example.expected}"
+        else:
+            outcome = f"should give {example.expected}, but: {result.feedback()}"
+        return f"On the example from the puzzle description:\n{example.input.rstrip()}\nthe solution {outcome}."
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract the worked examples from puzzle descriptions as fixtures")
+    parser.add_argument("days", nargs="*", type=int, help="Days to extract (defaults to every day)")
+    parser.add_argument("--force", action="store_true", help="Overwrite existing fixture files")
+    args = parser.parse_args()
+
+    day_dirs = [BASE_DIR / f"day{day}" for day in args.days] or sorted(
+        BASE_DIR.glob("day*"), key=lambda path: int(path.name[3:]))
+    for day_dir in day_dirs:
+        for part in (1, 2):
+            if args.force:
+                examples_path(day_dir, part).unlink(missing_ok=True)
+            examples = load_examples(day_dir, part)
+            summary = "; ".join(f"{len(example.input.splitlines())} lines -> {example.expected}" for example in examples)
+            print(f"{day_dir.name} part {part}: {summary or 'no example found'}")
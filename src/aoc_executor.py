@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import resource
+import signal
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from aoc_attempt_index import AttemptIndex
+    from aoc_worker_pool import WorkerPool
+
+DEFAULT_TIMEOUT_SECONDS = 60.0
+DEFAULT_CPU_TIME_SECONDS = 30.0
+DEFAULT_MEMORY_LIMIT_MB = 2048
+DEFAULT_PROFILE_SECONDS = 10.0
+
+# How much of stdout/stderr to quote back to the LLM as feedback
+FEEDBACK_TAIL_LINES = 20
+
+# How many of the hottest functions to report when a solution is too slow
+PROFILE_TOP_FUNCTIONS = 8
+
+# Runs a solution under cProfile for a bounded time, then prints the hottest functions as JSON.
+# The solution's own output is discarded so only the profile reaches stdout.
+PROFILER_SCRIPT = """
+import cProfile, contextlib, io, json, pstats, runpy, signal, sys
+
+class ProfileTimeout(BaseException):
+    pass
+
+def stop(signum, frame):
+    raise ProfileTimeout()
+
+solution_path, seconds, top = sys.argv[1], float(sys.argv[2]), int(sys.argv[3])
+sys.argv = [solution_path]
+signal.signal(signal.SIGALRM, stop)
+# The CPU limit's soft signal, in case the wall-clock alarm didn't get there first
+signal.signal(signal.SIGXCPU, stop)
+signal.setitimer(signal.ITIMER_REAL, seconds)
+
+profiler = cProfile.Profile()
+finished = True
+with contextlib.redirect_stdout(io.StringIO()):
+    profiler.enable()
+    try:
+        runpy.run_path(solution_path, run_name="__main__")
+    except ProfileTimeout:
+        finished = False
+    except BaseException:
+        pass
+    finally:
+        profiler.disable()
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+stats = pstats.Stats(profiler).stats
+hottest = sorted(stats.items(), key=lambda item: -item[1][2])[:top]
+print(json.dumps({
+    "finished": finished,
+    "functions": [
+        {"file": file, "line": line, "function": function, "calls": calls, "own_time": own_time, "total_time": total_time}
+        for (file, line, function), (_, calls, own_time, total_time, _) in hottest
+    ]
+}))
+"""
+
+
+@dataclass
+class ExecutionResult:
+    """Outcome of running a single solution file."""
+    solution_path: Path
+    returncode: Optional[int]
+    stdout: str
+    stderr: str
+    duration: float
+    timed_out: bool = False
+    expected_answer: Optional[str] = None
+    cpu_time: float = 0.0
+    peak_memory_mb: float = 0.0
+    cpu_limited: bool = False
+    hotspots: list[str] = field(default_factory=list)
+
+    @property
+    def answers(self) -> list[str]:
+        """The answers printed by the solution, taken as the last token of each output line."""
+        return printed_answers(self.stdout)
+
+    @property
+    def too_slow(self) -> bool:
+        """Whether the run was stopped for going over its wall-clock or CPU time budget."""
+        return self.timed_out or self.cpu_limited
+
+    @property
+    def correct(self) -> Optional[bool]:
+        """Whether the expected answer was printed, or None if there is nothing to compare against."""
+        if self.expected_answer is None:
+            return None
+        return not self.too_slow and self.returncode == 0 and self.expected_answer in self.answers
+
+    def feedback(self) -> str:
+        """Describe what went wrong, phrased as feedback for the LLM."""
+        if self.too_slow:
+            feedback = (f"The solution is too slow: it was stopped after {self.duration:.0f} seconds "
+                        f"({self.cpu_time:.0f}s of CPU time) without finishing. It needs a more efficient algorithm.")
+            if self.hotspots and self.hotspots[0].startswith("- "):
+                feedback += "\nProfiling showed most of the time is spent in:\n" + "\n".join(self.hotspots)
+            elif self.hotspots:
+                feedback += "\n" + "\n".join(self.hotspots)
+            return feedback
+        if self.returncode != 0:
+            if "MemoryError" in self.stderr or self.returncode == -signal.SIGKILL:
+                return "The solution ran out of memory. It needs a more memory-efficient approach."
+            return (f"The solution crashed with exit code {self.returncode}:\n"
+                    f"{_tail(self.stderr)}")
+        if not self.stdout.strip():
+            return "The solution ran but didn't print anything. It should print the final answer."
+        return f"The solution ran and printed:\n{_tail(self.stdout)}\nbut that is not the correct answer."
+
+
+def _tail(text: str, lines: int = FEEDBACK_TAIL_LINES) -> str:
+    return "\n".join(text.strip().splitlines()[-lines:])
+
+
+def printed_answers(stdout: str) -> list[str]:
+    """Extract the candidate answers from a solution's output (last token of each non-empty line)."""
+    answers = []
+    for line in stdout.splitlines():
+        tokens = re.split(r"[\s:=]+", line.strip())
+        if tokens and tokens[-1]:
+            answers.append(tokens[-1].rstrip(".!"))
+    return answers
+
+
+def load_expected_answer(day_dir: Path, part: int) -> Optional[str]:
+    """Load the stored answer for a day and part from input/answer_partN.txt, if there is one."""
+    answer_path = day_dir / "input" / f"answer_part{part}.txt"
+    if not answer_path.exists():
+        return None
+
+    with open(answer_path, "r") as f:
+        return f.read().strip() or None
+
+
+def _set_limits(memory_limit_mb: int, cpu_time_limit: Optional[float]):
+    def set_limits():
+        # Linux doesn't enforce RLIMIT_RSS, so the address space limit is what caps memory
+        limit_bytes = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+        if cpu_time_limit is not None:
+            # SIGXCPU at the soft limit, SIGKILL a second later if it's ignored
+            seconds = max(1, int(cpu_time_limit))
+            resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds + 1))
+    return set_limits
+
+
+def _read_pipe(pipe, chunks: list[str]):
+    chunks.append(pipe.read())
+    pipe.close()
+
+
+def run_solution(solution_path: Path,
+                 expected_answer: Optional[str] = None,
+                 timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                 memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB,
+                 cpu_time_limit: Optional[float] = DEFAULT_CPU_TIME_SECONDS,
+                 profile_seconds: Optional[float] = DEFAULT_PROFILE_SECONDS,
+                 index: Optional[AttemptIndex] = None,
+                 pool: Optional[WorkerPool] = None) -> ExecutionResult:
+    """
+    Run a solution file in a subprocess with the day directory as the working directory.
+
+    Args:
+        solution_path: Path to the solution file (expected to live in its day directory)
+        expected_answer: Optional answer to compare the printed output against
+        timeout: Wall-clock limit in seconds
+        memory_limit_mb: Address space limit for the subprocess in megabytes
+        cpu_time_limit: CPU time limit in seconds (RLIMIT_CPU), or None for no limit
+        profile_seconds: When the run goes over its time budget, profile it for this long to
+            find the hot functions (None to skip profiling)
+        index: Optional attempt index to record the outcome in
+        pool: Optional pool of pre-forked workers to run it on, instead of a fresh interpreter
+
+    Returns:
+        The captured output, exit status, timing and peak memory of the run
+    """
+    solution_path = solution_path.resolve()
+    if not solution_path.exists():
+        raise FileNotFoundError(f"No solution found at {solution_path}")
+
+    if pool is not None:
+        result = pool.run(solution_path, expected_answer, timeout, memory_limit_mb, cpu_time_limit)
+    else:
+        result = _run_cold(solution_path, expected_answer, timeout, memory_limit_mb, cpu_time_limit)
+
+    if result.too_slow and profile_seconds:
+        result.hotspots = profile_solution(solution_path, profile_seconds, memory_limit_mb=memory_limit_mb)
+    if index is not None:
+        index.record_run(result)
+    return result
+
+
+def _run_cold(solution_path: Path,
+              expected_answer: Optional[str],
+              timeout: float,
+              memory_limit_mb: int,
+              cpu_time_limit: Optional[float]) -> ExecutionResult:
+    """Run a solution as `python solution.py` in a fresh interpreter."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(solution_path)],
+        cwd=solution_path.parent,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+        preexec_fn=_set_limits(memory_limit_mb, cpu_time_limit)
+    )
+
+    # Read the pipes on threads and reap the process ourselves, so its resource usage is available
+    stdout, stderr = [], []
+    readers = [threading.Thread(target=_read_pipe, args=(process.stdout, stdout)),
+               threading.Thread(target=_read_pipe, args=(process.stderr, stderr))]
+    for reader in readers:
+        reader.start()
+
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        process.kill()
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    try:
+        _, status, usage = os.wait4(process.pid, 0)
+    finally:
+        timer.cancel()
+    process.returncode = os.waitstatus_to_exitcode(status)
+    for reader in readers:
+        reader.join()
+
+    return ExecutionResult(
+        solution_path=solution_path,
+        returncode=process.returncode,
+        stdout="".join(stdout),
+        stderr="".join(stderr),
+        duration=time.perf_counter() - start,
+        timed_out=timed_out.is_set(),
+        expected_answer=expected_answer,
+        cpu_time=usage.ru_utime + usage.ru_stime,
+        # ru_maxrss is in kilobytes on Linux
+        peak_memory_mb=usage.ru_maxrss / 1024,
+        cpu_limited=process.returncode == -signal.SIGXCPU or (
+            cpu_time_limit is not None and usage.ru_utime + usage.ru_stime >= cpu_time_limit
+        )
+    )
+
+
+def profile_solution(solution_path: Path,
+                     seconds: float = DEFAULT_PROFILE_SECONDS,
+                     top: int = PROFILE_TOP_FUNCTIONS,
+                     memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB) -> list[str]:
+    """
+    Profile a solution for a bounded time and describe its hottest functions.
+
+    The profiling run gets the same memory limit as the run it's explaining, and a CPU
+    limit just past `seconds` in case a long call in C code keeps the profiler's own
+    alarm from going off.
+
+    Returns:
+        One line per function, hottest first, or a single sentence saying why profiling
+        stopped without results
+    """
+    stopped = f"Profiling was stopped after {seconds:.0f}s"
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-c", PROFILER_SCRIPT, str(solution_path), str(seconds), str(top)],
+            cwd=solution_path.parent,
+            capture_output=True,
+            text=True,
+            timeout=seconds + 10,
+            preexec_fn=_set_limits(memory_limit_mb, math.ceil(seconds) + 1)
+        )
+    except subprocess.TimeoutExpired:
+        return [f"{stopped} (it didn't return from a single long call), so there are no hot functions to report."]
+    try:
+        profile = json.loads(completed.stdout.strip().splitlines()[-1])
+    except (json.JSONDecodeError, IndexError):
+        reason = ("it hit the CPU time limit in a single long call"
+                  if completed.returncode in (-signal.SIGXCPU, -signal.SIGKILL)
+                  else f"the profiler exited with code {completed.returncode}")
+        return [f"{stopped} ({reason}), so there are no hot functions to report."]
+
+    hotspots = []
+    for function in profile["functions"]:
+        # Skip the interpreter's own bookkeeping (imports, compiling the solution)
+        if function["own_time"] < 0.01:
+            continue
+        location = Path(function["file"]).name if function["file"] != "~" else "builtin"
+        hotspots.append(f"- {function['function']} ({location}:{function['line']}): "
+                        f"{function['own_time']:.2f}s own time, {function['total_time']:.2f}s total, "
+                        f"{function['calls']} calls")
+    return hotspots
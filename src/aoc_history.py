@@ -0,0 +1,121 @@
+import ast
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from aoc_input_sampler import CHARS_PER_TOKEN, estimate_tokens
+
+# How much of an older attempt's feedback survives summarisation
+SUMMARY_FEEDBACK_CHARS = 300
+
+
+@dataclass
+class AttemptRecord:
+    """A failed solution attempt and the feedback it got."""
+    attempt_number: int
+    solution: str
+    feedback: str
+
+
+@dataclass
+class CompactionPolicy:
+    """
+    How much of the previous attempts to send back to the LLM.
+
+    Args:
+        keep_full: How many of the latest attempts are sent in full (None keeps every attempt in full)
+        token_budget: Hard cap on the tokens the history may use (None for no cap); the oldest
+            summaries are dropped first, then older full attempts are summarised and dropped,
+            then the latest feedback and finally the latest code are truncated. Only the fixed
+            wording around the latest attempt can't be cut
+    """
+    keep_full: Optional[int] = 1
+    token_budget: Optional[int] = 8000
+
+
+def key_idea(solution: str) -> str:
+    """Describe the approach of a solution from its docstrings, leading comments and function names."""
+    try:
+        tree = ast.parse(solution)
+    except SyntaxError:
+        first_line = next((line.strip() for line in solution.splitlines() if line.strip()), "")
+        return f"did not compile (starts with: {first_line[:100]})"
+
+    functions = [node for node in ast.walk(tree) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+    descriptions = []
+    for node in [tree, *functions]:
+        docstring = ast.get_docstring(node)
+        if docstring:
+            descriptions.append(docstring.strip().splitlines()[0])
+
+    if not descriptions:
+        comments = [line.strip().lstrip("#").strip() for line in solution.splitlines() if line.strip().startswith("#")]
+        descriptions = [comment for comment in comments if comment][:2]
+
+    idea = f"functions {', '.join(node.name for node in functions)}" if functions else "a top-level script"
+    if descriptions:
+        idea += f"; {' '.join(descriptions[:3])}"
+    return idea
+
+
+def full_messages(attempt: AttemptRecord) -> list[tuple[str, str]]:
+    return [
+        ("ai", f"Here was my solution attempt #{attempt.attempt_number}:\n```python\n{attempt.solution}\n```"),
+        ("human", f"This solution didn't work. Here's what happened: {attempt.feedback}\n"
+                  f"Please provide an improved solution that addresses these issues.")
+    ]
+
+
+def summary_messages(attempt: AttemptRecord) -> list[tuple[str, str]]:
+    feedback = attempt.feedback.strip()
+    if len(feedback) > SUMMARY_FEEDBACK_CHARS:
+        feedback = feedback[:SUMMARY_FEEDBACK_CHARS] + "..."
+    return [
+        ("ai", f"Solution attempt #{attempt.attempt_number} (code omitted) used {key_idea(attempt.solution)}"),
+        ("human", f"Attempt #{attempt.attempt_number} didn't work: {feedback}")
+    ]
+
+
+def history_tokens(messages: list[tuple[str, str]]) -> int:
+    return sum(estimate_tokens(content) for _, content in messages)
+
+
+def compact_history(attempts: list[AttemptRecord], policy: CompactionPolicy) -> tuple[list[tuple[str, str]], int]:
+    """
+    Build the chat history for the next attempt according to a compaction policy.
+
+    Returns:
+        The (role, content) messages to send and how many tokens compaction saved
+    """
+    uncompacted = [message for attempt in attempts for message in full_messages(attempt)]
+    keep_full = len(attempts) if policy.keep_full is None else policy.keep_full
+    split = max(0, len(attempts) - keep_full)
+
+    summaries = [summary_messages(attempt) for attempt in attempts[:split]]
+    full = attempts[split:]
+
+    def total() -> int:
+        return history_tokens([m for summary in summaries for m in summary] +
+                              [m for attempt in full for m in full_messages(attempt)])
+
+    if policy.token_budget is not None:
+        # Drop the oldest summaries first, then summarise the older full attempts (which get
+        # dropped in turn if that isn't enough), so only the latest attempt is left in full
+        while total() > policy.token_budget and (summaries or len(full) > 1):
+            if summaries:
+                summaries.pop(0)
+            else:
+                summaries.append(summary_messages(full.pop(0)))
+
+        # Then squeeze the latest feedback and, if that isn't enough, the code it refers to
+        for field in ("feedback", "solution"):
+            overflow = total() - policy.token_budget
+            if overflow <= 0 or not full:
+                break
+            text = getattr(full[-1], field)
+            marker = f"\n[{field} truncated]"
+            keep_chars = max(0, len(text) - (overflow + 1) * CHARS_PER_TOKEN - len(marker))
+            full[-1] = replace(full[-1], **{field: text[:keep_chars] + marker})
+
+    messages = [message for summary in summaries for message in summary] + \
+               [message for attempt in full for message in full_messages(attempt)]
+    return messages, history_tokens(uncompacted) - history_tokens(messages)
@@ -0,0 +1,255 @@
+import argparse
+import random
+import string
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+# Day 8 antenna frequencies: lowercase, uppercase and digits
+FREQUENCIES = string.ascii_lowercase + string.ascii_uppercase + string.digits
+
+
+@dataclass
+class InputGenerator:
+    """Produces valid puzzle inputs for one day at any scale."""
+    day: int
+    # What the size parameter controls, e.g. "grid side" or "digits"
+    size_means: str
+    # Sizes a scaling run goes through by default, smallest first
+    sizes: list[int]
+    generate: Callable[[int, random.Random], str]
+
+
+def _location_lists(size: int, rng: random.Random) -> str:
+    # Half the right list repeats numbers from the left, so part 2's similarity score isn't always 0
+    left = [rng.randint(10000, 99999) for _ in range(size)]
+    right = [rng.choice(left) if rng.random() < 0.5 else rng.randint(10000, 99999) for _ in range(size)]
+    return "".join(f"{a}   {b}\n" for a, b in zip(left, right))
+
+
+def _reports(size: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(size):
+        direction = rng.choice([-1, 1])
+        # Levels stay between 1 and 99 like the real input, whatever the steps and corruptions add up to
+        levels = [rng.randint(30, 89) if direction < 0 else rng.randint(9, 60)]
+        for _ in range(rng.randint(4, 7)):
+            levels.append(levels[-1] + direction * rng.randint(1, 3))
+        # A third stay safe, a third can be fixed by the dampener, a third are broken in two places
+        for _ in range(rng.choice([0, 1, 2])):
+            levels[rng.randrange(len(levels))] += rng.choice([-4, -1, 0, 5])
+        lines.append(" ".join(map(str, levels)))
+    return "\n".join(lines) + "\n"
+
+
+def _corrupted_memory(size: int, rng: random.Random) -> str:
+    junk = ["who()", "what()", "how()", "from()", "where()", "select()", "when()", "why(872,51)", "mul(4*",
+            "mul ( 2 , 4 )", "mul[3,7]", "mul(32,64]", "?mul(6,9!", "don't", "do(", *"!@#$%^&*()[]{}<>,;:'~ -+/"]
+    tokens = []
+    for _ in range(size):
+        tokens.append(f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})")
+        tokens.extend(rng.choices(junk, k=rng.randint(1, 6)))
+        if rng.random() < 0.1:
+            tokens.append(rng.choice(["do()", "don't()"]))
+    # About 140 instructions per line, like the real input
+    lines = ["".join(tokens[start:start + 600]) for start in range(0, len(tokens), 600)]
+    return "\n".join(lines) + "\n"
+
+
+def _word_search(size: int, rng: random.Random) -> str:
+    # Letter frequencies of the real input
+    rows = ("".join(rng.choices("XMAS", weights=[19, 36, 25, 20], k=size)) for _ in range(size))
+    return "\n".join(rows) + "\n"
+
+
+def _page_ordering(size: int, rng: random.Random) -> str:
+    """Rules between each page and the next 23 in a hidden order, and updates drawn from those windows."""
+    if size < 5:
+        raise ValueError("Day 5 needs at least 5 pages")
+    pages = rng.sample(range(10, 10 + size * 10), size)
+    window = min(24, size)
+    rules = [f"{pages[i]}|{pages[j]}" for i in range(size) for j in range(i + 1, min(size, i + window))]
+    rng.shuffle(rules)
+
+    updates = []
+    for _ in range(size * 4):
+        start = rng.randrange(size - window + 1)
+        # Every pair of pages in a window has a rule, and updates have a middle page
+        length = rng.choice(range(5, window + 1, 2))
+        update = [pages[i] for i in sorted(rng.sample(range(start, start + window), length))]
+        if rng.random() < 0.5:
+            rng.shuffle(update)
+        updates.append(",".join(map(str, update)))
+    return "\n".join(rules) + "\n\n" + "\n".join(updates) + "\n"
+
+
+def _guard_path(cells: bytearray, size: int, position: int) -> int:
+    """How many steps the guard takes before walking off the map, or 0 if it gets stuck in a loop."""
+    row, column = divmod(position, size)
+    moves = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+    direction = 0
+    seen = set()
+    while (row, column, direction) not in seen:
+        seen.add((row, column, direction))
+        next_row, next_column = row + moves[direction][0], column + moves[direction][1]
+        if not (0 <= next_row < size and 0 <= next_column < size):
+            return len(seen)
+        if cells[next_row * size + next_column] == ord("#"):
+            direction = (direction + 1) % 4
+        else:
+            row, column = next_row, next_column
+    return 0
+
+
+def _lab_map(size: int, rng: random.Random) -> str:
+    cells = bytearray(b"." * (size * size))
+    # The real map has obstacles on about 5% of cells
+    for position in rng.sample(range(size * size), size * size // 20):
+        cells[position] = ord("#")
+    # Part 1 assumes the guard leaves the map, and most starts leave within a few dozen steps,
+    # so the guard starts at the one with the longest way out of a few dozen tries
+    starts = [position for position in rng.sample(range(size * size), min(50, size * size)) if cells[position] == ord(".")]
+    position = max(starts, key=lambda start: _guard_path(cells, size, start))
+    if not _guard_path(cells, size, position):
+        raise ValueError(f"Couldn't find a way out of a {size}x{size} map, try another seed")
+    cells[position] = ord("^")
+    return "".join(cells[start:start + size].decode() + "\n" for start in range(0, size * size, size))
+
+
+def _reachable_without_concatenation(target: int, operands: list[int]) -> bool:
+    """Whether + and * alone can make the target, working backwards from the last operand."""
+    if len(operands) == 1:
+        return target == operands[0]
+    last = operands[-1]
+    if target % last == 0 and _reachable_without_concatenation(target // last, operands[:-1]):
+        return True
+    return target > last and _reachable_without_concatenation(target - last, operands[:-1])
+
+
+def _calibrations(size: int, rng: random.Random) -> str:
+    """200 equations of `size` operands each: a third need `||`, a third have made-up targets."""
+    if size < 2:
+        raise ValueError("Day 7 needs at least 2 operands")
+    lines = []
+    for i in range(200):
+        while True:
+            operands = [rng.randint(1, 9) if rng.random() < 0.6 else rng.randint(10, 999) for _ in range(size)]
+            operators = rng.choices(["+", "*"] if i % 3 == 0 else ["+", "*", "||"], k=size - 1)
+            if i % 3 == 1 and "||" not in operators:
+                operators[rng.randrange(size - 1)] = "||"
+            target = operands[0]
+            for operator, operand in zip(operators, operands[1:]):
+                if operator == "+":
+                    target += operand
+                elif operator == "*":
+                    target *= operand
+                else:
+                    target = int(f"{target}{operand}")
+            # Using || doesn't mean it's needed: + and * can happen to make the same target
+            if i % 3 != 1 or not _reachable_without_concatenation(target, operands):
+                break
+        if i % 3 == 2:
+            target += rng.randint(1, 9)
+        lines.append(f"{target}: {' '.join(map(str, operands))}")
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n"
+
+
+def _antenna_map(size: int, rng: random.Random) -> str:
+    # The real 50x50 map has about 200 antennas, so this keeps the number per row the same
+    cells = ["."] * (size * size)
+    for position in rng.sample(range(size * size), min(size * 4, size * size)):
+        cells[position] = rng.choice(FREQUENCIES)
+    return "".join("".join(cells[start:start + size]) + "\n" for start in range(0, size * size, size))
+
+
+def _disk_map(size: int, rng: random.Random) -> str:
+    # Alternating file and free space lengths, starting and ending with a file
+    size = size if size % 2 else size + 1
+    digits = [""] * size
+    digits[0::2] = rng.choices("123456789", k=(size + 1) // 2)
+    digits[1::2] = rng.choices("0123456789", k=size // 2)
+    return "".join(digits) + "\n"
+
+
+def _topographic_map(size: int, rng: random.Random) -> str:
+    """Random heights with hiking trails (0 up to 9, one step at a time) carved into them."""
+    heights = [[rng.choice("0123456789") for _ in range(size)] for _ in range(size)]
+    moves = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+    # About as many trails per cell as the real map; later trails can cut through earlier ones
+    for _ in range(size * size // 8):
+        row, column = rng.randrange(size), rng.randrange(size)
+        trail = [(row, column)]
+        while len(trail) < 10:
+            options = [(row + dr, column + dc) for dr, dc in moves
+                       if 0 <= row + dr < size and 0 <= column + dc < size and (row + dr, column + dc) not in trail]
+            if not options:
+                break
+            row, column = rng.choice(options)
+            trail.append((row, column))
+        if len(trail) == 10:
+            for height, (row, column) in enumerate(trail):
+                heights[row][column] = str(height)
+    return "".join("".join(row) + "\n" for row in heights)
+
+
+def _stones(size: int, rng: random.Random) -> str:
+    stones = [rng.choice([0, rng.randint(1, 99), rng.randint(100, 9999999)]) for _ in range(size)]
+    return " ".join(map(str, stones)) + "\n"
+
+
+GENERATORS = {generator.day: generator for generator in [
+    InputGenerator(1, "lines", [1000, 10000, 100000, 1000000], _location_lists),
+    InputGenerator(2, "reports", [1000, 10000, 100000, 1000000], _reports),
+    InputGenerator(3, "mul instructions", [700, 7000, 70000, 700000], _corrupted_memory),
+    InputGenerator(4, "grid side", [140, 280, 560, 1120, 2240], _word_search),
+    InputGenerator(5, "pages", [50, 100, 200, 400, 800, 1600, 3200], _page_ordering),
+    InputGenerator(6, "grid side", [130, 260, 520, 1040, 2080, 5000], _lab_map),
+    InputGenerator(7, "operands per equation", [4, 6, 8, 10, 12, 14, 16, 20], _calibrations),
+    InputGenerator(8, "grid side", [50, 100, 200, 400, 800, 1600], _antenna_map),
+    InputGenerator(9, "digits", [20000, 100000, 1000000, 10000000], _disk_map),
+    InputGenerator(10, "grid side", [41, 82, 164, 328, 656, 1312], _topographic_map),
+    InputGenerator(11, "stones", [8, 32, 128, 512, 2048], _stones),
+]}
+
+
+def generate_input(day: int, size: int, seed: int = 0) -> str:
+    """
+    Generate a puzzle input for a day.
+
+    The same day, size and seed always give the same input.
+
+    Args:
+        day: Day number of the puzzle
+        size: Scale of the input, which means something different per day (see GENERATORS)
+        seed: Seed for the random choices
+    """
+    if day not in GENERATORS:
+        raise ValueError(f"No input generator for day {day}")
+    # Seeded from all three, so a size isn't just a prefix of a bigger size's input
+    return GENERATORS[day].generate(size, random.Random(f"{day}:{size}:{seed}"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate puzzle inputs at any scale")
+    parser.add_argument("day", type=int, nargs="?")
+    parser.add_argument("size", type=int, nargs="?", help="Defaults to the day's smallest default size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="File to write the input to (defaults to stdout)")
+    parser.add_argument("--list", action="store_true", help="List the generators and their default sizes")
+    args = parser.parse_args()
+
+    if args.list or args.day is None:
+        for generator in GENERATORS.values():
+            print(f"day{generator.day:<3} {generator.size_means:<22} {', '.join(map(str, generator.sizes))}")
+        sys.exit(0)
+
+    if args.day not in GENERATORS:
+        parser.error(f"No input generator for day {args.day}")
+    text = generate_input(args.day, args.size or GENERATORS[args.day].sizes[0], args.seed)
+    if args.output:
+        args.output.write_text(text)
+        print(f"Wrote {len(text)} characters to {args.output}")
+    else:
+        sys.stdout.write(text)
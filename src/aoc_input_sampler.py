@@ -0,0 +1,143 @@
+import math
+import re
+import string
+from pathlib import Path
+
+DEFAULT_TOKEN_BUDGET = 1000
+
+# Rough average for English/code/puzzle text, close enough for budgeting prompts
+CHARS_PER_TOKEN = 4
+
+# Longer digit runs (e.g. day 9's disk map) are data rather than numbers
+MAX_NUMBER_DIGITS = 18
+
+# Room left for the "... (N more lines)" marker after each section's head
+TRUNCATION_MARKER_CHARS = 40
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate how many tokens a piece of text will take up in a prompt."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_sections(text: str) -> list[list[str]]:
+    """Split the input into blank-line separated sections of lines."""
+    sections = [[]]
+    for line in text.splitlines():
+        if line.strip():
+            sections[-1].append(line)
+        elif sections[-1]:
+            sections.append([])
+    return [section for section in sections if section]
+
+
+def _character_classes(text: str) -> str:
+    classes = []
+    if any(c.isdigit() for c in text):
+        classes.append("digits")
+    if any(c in string.ascii_lowercase for c in text):
+        classes.append("lowercase letters")
+    if any(c in string.ascii_uppercase for c in text):
+        classes.append("uppercase letters")
+    if " " in text:
+        classes.append("spaces")
+    symbols = sorted({c for c in text if c in string.punctuation})
+    if symbols:
+        classes.append(f"symbols {''.join(symbols)}")
+    return ", ".join(classes) or "none"
+
+
+def summarize_input(text: str) -> str:
+    """Describe the structure of a puzzle input: size, character classes, numbers and sections."""
+    lines = text.splitlines()
+    widths = [len(line) for line in lines if line.strip()] or [0]
+    summary = [
+        f"- Lines: {len(lines)}",
+        f"- Line width: {min(widths)} characters" if min(widths) == max(widths) else
+        f"- Line width: {min(widths)} to {max(widths)} characters",
+        f"- Characters: {_character_classes(text)}"
+    ]
+
+    digit_runs = re.findall(r"-?\d+", text)
+    numbers = [int(n) for n in digit_runs if len(n.lstrip("-")) <= MAX_NUMBER_DIGITS]
+    long_runs = [n for n in digit_runs if len(n.lstrip("-")) > MAX_NUMBER_DIGITS]
+    if long_runs:
+        summary.append(f"- Digit strings: {len(long_runs)} of up to {max(map(len, long_runs))} digits "
+                       f"(too long to be single numbers)")
+    if numbers:
+        per_line = [len(re.findall(r"-?\d+", line)) for line in lines]
+        summary.append(f"- Numbers: {len(numbers)} in total, ranging from {min(numbers)} to {max(numbers)}, "
+                       f"{min(per_line)} to {max(per_line)} per line")
+
+    sections = split_sections(text)
+    if len(sections) > 1:
+        sizes = ", ".join(str(len(section)) for section in sections)
+        summary.append(f"- Sections: {len(sections)} separated by blank lines, with {sizes} lines respectively")
+
+    return "\n".join(summary)
+
+
+def _head(lines: list[str], char_budget: int) -> list[str]:
+    head = []
+    for line in lines:
+        if char_budget <= 0:
+            break
+        if len(line) > char_budget:
+            head.append(f"{line[:char_budget]}... ({len(line) - char_budget} more characters)")
+            break
+        head.append(line)
+        char_budget -= len(line) + 1
+
+    if len(head) < len(lines):
+        head.append(f"... ({len(lines) - len(head)} more lines)")
+    return head
+
+
+def sample_input(text: str, token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """
+    Reduce a puzzle input to its first lines plus a structural summary within a token budget.
+
+    Inputs that already fit in the budget are returned untouched. Otherwise the budget left
+    after the summary is shared between the head of each blank-line separated section, so
+    inputs made of several parts (e.g. rules followed by updates) show an example of each.
+
+    Args:
+        text: The full puzzle input
+        token_budget: Roughly how many prompt tokens the sample may use
+
+    Returns:
+        The sampled input to show the LLM
+    """
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    summary = f"Input summary:\n{summarize_input(text)}\n\nFirst lines of the input:\n"
+    char_budget = max(0, (token_budget - estimate_tokens(summary)) * CHARS_PER_TOKEN)
+
+    sections = split_sections(text)
+    section_budget = char_budget // max(1, len(sections)) - TRUNCATION_MARKER_CHARS
+    heads = ["\n".join(_head(section, section_budget)) for section in sections]
+
+    return summary + "\n\n".join(heads)
+
+
+def report_savings(base_dir: Path, token_budget: int = DEFAULT_TOKEN_BUDGET):
+    """Print the prompt tokens saved by sampling each day's input."""
+    print(f"{'Day':<6}{'Full':>10}{'Sampled':>10}{'Saved':>10}")
+    total_full = total_sampled = 0
+    days = sorted(base_dir.glob("day*/input/input.txt"), key=lambda p: int(p.parent.parent.name[3:]))
+    for input_path in days:
+        text = input_path.read_text()
+        full = estimate_tokens(text)
+        sampled = estimate_tokens(sample_input(text, token_budget))
+        total_full += full
+        total_sampled += sampled
+        saved = 1 - sampled / full if full else 0.0
+        print(f"{input_path.parent.parent.name:<6}{full:>10}{sampled:>10}{saved:>10.0%}")
+
+    saved = 1 - total_sampled / total_full if total_full else 0.0
+    print(f"{'Total':<6}{total_full:>10}{total_sampled:>10}{saved:>10.0%}")
+
+
+if __name__ == "__main__":
+    report_savings(Path(__file__).parent.resolve())
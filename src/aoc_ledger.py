@@ -0,0 +1,132 @@
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_LEDGER_PATH = Path(__file__).parent.resolve() / ".aoc" / "ledger.jsonl"
+
+# USD per 1M tokens: (input, cached input, output)
+MODEL_PRICES = {
+    "gpt-4": (30.00, 30.00, 60.00),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4o-mini": (0.150, 0.075, 0.60),
+    "claude-3-5-sonnet": (3.00, 0.30, 15.00),
+    "claude-3-5-haiku": (0.80, 0.08, 4.00),
+}
+
+
+# Writing a prompt to Anthropic's cache costs this much more than plain input (OpenAI doesn't report cache writes)
+CACHE_WRITE_PREMIUM = 1.25
+
+
+def model_prices(model_name: str) -> Optional[tuple[float, float, float]]:
+    """Look up the prices for a model, matching dated variants (e.g. gpt-4o-2024-08-06) by prefix."""
+    matches = [name for name in MODEL_PRICES if model_name.startswith(name)]
+    if not matches:
+        return None
+    return MODEL_PRICES[max(matches, key=len)]
+
+
+def estimate_cost(model_name: str,
+                  prompt_tokens: int,
+                  completion_tokens: int,
+                  cached_prompt_tokens: int = 0,
+                  cache_write_tokens: int = 0) -> float:
+    """
+    Compute the cost of a call in USD (0 for models without known prices, e.g. local ones).
+
+    Cached and cache write tokens are part of prompt_tokens, as providers report them.
+    """
+    prices = model_prices(model_name)
+    if prices is None:
+        return 0.0
+    input_price, cached_input_price, output_price = prices
+    uncached_prompt_tokens = prompt_tokens - cached_prompt_tokens - cache_write_tokens
+    return (uncached_prompt_tokens * input_price
+            + cached_prompt_tokens * cached_input_price
+            + cache_write_tokens * input_price * CACHE_WRITE_PREMIUM
+            + completion_tokens * output_price) / 1_000_000
+
+
+@dataclass
+class LedgerRecord:
+    """A single LLM call made by the solver."""
+    day: int
+    part: int
+    attempt: int
+    provider: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    time_to_first_token: float
+    latency: float
+    cost: float
+    estimated_tokens: bool = False
+    cached_prompt_tokens: int = 0
+    cache_write_tokens: int = 0
+    history_tokens_saved: int = 0
+    timestamp: float = field(default_factory=time.time)
+
+
+class CallLedger:
+    """Append-only JSONL ledger of LLM calls, safe to share between threads and tasks."""
+
+    def __init__(self, path: Path = DEFAULT_LEDGER_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def append(self, record: LedgerRecord):
+        # A single write of a whole line in append mode keeps records intact across processes
+        line = json.dumps(asdict(record)) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def records(self) -> list[LedgerRecord]:
+        if not self.path.exists():
+            return []
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            return [LedgerRecord(**json.loads(line)) for line in f if line.strip()]
+
+    def report(self) -> str:
+        """Aggregate the ledger by day and model."""
+        totals = defaultdict(lambda: defaultdict(float))
+        for record in self.records():
+            row = totals[(record.day, record.model)]
+            row["calls"] += 1
+            row["prompt_tokens"] += record.prompt_tokens
+            row["cached_prompt_tokens"] += record.cached_prompt_tokens
+            row["completion_tokens"] += record.completion_tokens
+            row["time_to_first_token"] += record.time_to_first_token
+            row["latency"] += record.latency
+            row["cost"] += record.cost
+            row["history_tokens_saved"] += record.history_tokens_saved
+
+        header = (f"{'Day':<5}{'Model':<28}{'Calls':>7}{'Prompt':>10}{'Cached':>8}{'Completion':>12}"
+                  f"{'Hist saved':>12}{'Avg TTFT':>10}{'Avg latency':>13}{'Cost':>10}")
+        lines = [header, "-" * len(header)]
+        grand_total = 0.0
+        for (day, model), row in sorted(totals.items()):
+            calls = row["calls"]
+            grand_total += row["cost"]
+            cache_hit_rate = row["cached_prompt_tokens"] / row["prompt_tokens"] if row["prompt_tokens"] else 0.0
+            lines.append(f"{day:<5}{model:<28}{calls:>7.0f}{row['prompt_tokens']:>10.0f}{cache_hit_rate:>8.0%}"
+                         f"{row['completion_tokens']:>12.0f}{row['history_tokens_saved']:>12.0f}"
+                         f"{row['time_to_first_token'] / calls:>9.2f}s"
+                         f"{row['latency'] / calls:>12.2f}s{row['cost']:>10.4f}")
+        lines.append("-" * len(header))
+        lines.append(f"{'Total':<5}{'':<28}{'':>7}{'':>10}{'':>8}{'':>12}{'':>12}{'':>10}{'':>13}{grand_total:>10.4f}")
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    ledger = CallLedger(Path(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_LEDGER_PATH)
+    if len(sys.argv) > 1 and sys.argv[1] != "report":
+        print("Usage: python aoc_ledger.py report [ledger_path]")
+        sys.exit(1)
+    print(ledger.report())
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.resolve() / ".aoc" / "llm_cache.sqlite"
+DEFAULT_MAX_SIZE_MB = 100.0
+
+
+class LLMResponseCache:
+    """
+    Content-addressed on-disk cache of LLM responses.
+
+    Responses are keyed on a hash of the provider, model name and fully rendered
+    message list, stored in SQLite and evicted least-recently-used first once the
+    stored responses exceed the size limit. Every operation opens its own connection,
+    so one cache can be shared between threads, tasks and solver processes.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_size_mb: float = DEFAULT_MAX_SIZE_MB):
+        self.path = path
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_accessed REAL NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_last_accessed ON responses (last_accessed)")
+            conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(provider: str, model_name: str, messages: list[BaseMessage], variant: int = 0) -> str:
+        """
+        Hash a request into a cache key.
+
+        Args:
+            provider: The model provider name
+            model_name: The specific model name
+            messages: The fully rendered messages sent to the model
+            variant: Distinguishes independent samples of the same prompt (e.g. concurrent candidates)
+        """
+        payload = json.dumps({
+            "provider": provider,
+            "model": model_name,
+            "messages": [[message.type, message.content] for message in messages],
+            "variant": variant
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE responses SET last_accessed = ? WHERE key = ?", (time.time(), key))
+            self._count(conn, "hits" if row is not None else "misses")
+
+        with self._lock:
+            if row is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row is not None else None
+
+    def put(self, key: str, response: str):
+        """Store a response and evict the least recently used entries if over the size limit."""
+        size = len(response.encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, size, last_accessed) VALUES (?, ?, ?, ?)",
+                    (key, response, size, time.time())
+                )
+                self._evict(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, conn: sqlite3.Connection):
+        total_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return
+
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_accessed").fetchall():
+            if total_size <= self.max_size_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total_size -= size
+            evicted += 1
+        self._count(conn, "evictions", evicted)
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, name: str, amount: int = 1):
+        conn.execute(
+            "INSERT INTO stats (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + ?",
+            (name, amount, amount)
+        )
+
+    def stats(self) -> dict:
+        """Hit/miss counts for this instance and for the cache as a whole."""
+        with self._connect() as conn:
+            totals = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "total_hits": totals.get("hits", 0),
+            "total_misses": totals.get("misses", 0),
+            "evictions": totals.get("evictions", 0),
+            "entries": entries,
+            "size_bytes": size
+        }
+
+    def format_stats(self) -> str:
+        stats = self.stats()
+        lookups = stats["total_hits"] + stats["total_misses"]
+        hit_rate = stats["total_hits"] / lookups if lookups else 0.0
+        return (f"LLM cache: {stats['hits']} hits / {stats['misses']} misses this run, "
+                f"{stats['total_hits']} / {stats['total_misses']} overall ({hit_rate:.0%} hit rate), "
+                f"{stats['entries']} entries, {stats['size_bytes'] / 1024:.1f}KB, {stats['evictions']} evicted")
+
+    def clear(self):
+        """Remove every cached response and reset the stats."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM stats")
+
+
+if __name__ == "__main__":
+    cache = LLMResponseCache()
+    if len(sys.argv) > 1 and sys.argv[1] == "clear":
+        cache.clear()
+        print(f"Cleared {cache.path}")
+    else:
+        print(cache.format_stats())
@@ -1,24 +1,209 @@
+from __future__ import annotations
+
 import os
+import re
+import threading
+import time
+import asyncio
+from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 from enum import Enum
-from typing import Literal, Optional
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.messages import HumanMessage, AIMessage
-from langchain.globals import set_debug
-
-set_debug(True)
-
-# Load environment variables
-load_dotenv()
+from typing import TYPE_CHECKING, Awaitable, Callable, Literal, Optional
+from aoc_executor import (DEFAULT_CPU_TIME_SECONDS, DEFAULT_MEMORY_LIMIT_MB, DEFAULT_TIMEOUT_SECONDS,
+                          load_expected_answer, run_solution)
+from aoc_llm_cache import LLMResponseCache
+from aoc_input_sampler import DEFAULT_TOKEN_BUDGET, estimate_tokens, sample_input
+from aoc_ledger import CallLedger, LedgerRecord, estimate_cost
+from aoc_streaming import SolutionStreamWriter
+from aoc_rate_limiter import ProviderRateLimiter, get_rate_limiter
+from aoc_history import AttemptRecord, CompactionPolicy, compact_history
+from aoc_patch import EDIT_FORMAT_INSTRUCTIONS, PatchError, apply_edits
+from aoc_attempt_index import AttemptIndex
+from aoc_dedup import duplicate_feedback, fingerprint
+from aoc_description import get_description_cache
+from aoc_examples import check_examples, load_examples
+from aoc_worker_pool import get_worker_pool
+
+# langchain and the provider SDKs take seconds to import, so they're only imported when first
+# needed - listing, replaying or running solutions never pays for them
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.messages import BaseMessage, BaseMessageChunk
+    from langchain_core.output_parsers import StrOutputParser
+
+    from aoc_client_pool import SharedClients
+
+SYSTEM_MESSAGE = """You are an expert Python programmer helping to solve Advent of Code puzzles.
+Generate a complete Python solution for the given puzzle description.
+The solution should:
+1. Be well-commented and clearly explain the approach
+2. Include proper error handling
+3. Be efficient and follow Python best practices
+4. Include type hints where appropriate
+5. Parse the input file correctly from 'input/input.txt' relative to the script's location
+6. Print the final answer
+
+Important: The input file is located at 'input/input.txt' relative to the script.
+Your solution should use this path to read the input file.
+
+Return only the Python code, no explanations before or after."""
+
+# Completion size assumed when pacing requests against tokens-per-minute limits
+EXPECTED_COMPLETION_TOKENS = 1500
 
 
 class ModelProvider(str, Enum):
     OPENAI = "openai"
     ANTHROPIC = "anthropic"
+    LOCAL = "local"
+
+
+# Cheapest and fastest first, the way I used to swap them by hand
+DEFAULT_CASCADE_LADDER = [
+    (ModelProvider.OPENAI, "gpt-4o-mini"),
+    (ModelProvider.OPENAI, "gpt-4o"),
+    (ModelProvider.ANTHROPIC, "claude-3-5-sonnet-latest"),
+]
+
+
+@dataclass
+class CascadeLevel:
+    """Time and money spent on one model of the ladder for one puzzle part."""
+    day: int
+    part: int
+    provider: str
+    model: str
+    attempts: int = 0
+    duration: float = 0.0
+    cost: float = 0.0
+    solved: bool = False
+
+
+@dataclass
+class CascadePolicy:
+    """
+    Start with the cheapest model and escalate up a ladder of models as attempts fail.
+
+    The deadline and budget are per day, so part 1 and part 2 solved with the same policy
+    share them. They're checked between attempts, so a call or run in progress finishes.
+
+    Args:
+        ladder: (provider, model_name) pairs to go through, cheapest first
+        failures_per_level: Failed verifications before escalating to the next model
+        day_deadline: Seconds a day may take before giving up (None for no deadline)
+        day_budget: USD a day may cost before giving up (None for no cap)
+    """
+    ladder: list[tuple[ModelProvider, str]] = field(default_factory=lambda: list(DEFAULT_CASCADE_LADDER))
+    failures_per_level: int = 2
+    day_deadline: Optional[float] = None
+    day_budget: Optional[float] = None
+    levels: list[CascadeLevel] = field(default_factory=list, init=False)
+    _day_started: dict[int, float] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        if not self.ladder:
+            raise ValueError("A cascade needs at least one model")
+        if self.failures_per_level < 1:
+            raise ValueError("failures_per_level must be at least 1")
+
+    def start_day(self, day: int):
+        with self._lock:
+            self._day_started.setdefault(day, time.perf_counter())
+
+    def enter_level(self, day: int, part: int, provider: ModelProvider, model_name: str) -> CascadeLevel:
+        level = CascadeLevel(day, part, provider.value, model_name)
+        with self._lock:
+            self.levels.append(level)
+        return level
+
+    @property
+    def attempts_to_top(self) -> int:
+        """Attempts it takes to give every model in the ladder its full share of failures."""
+        return len(self.ladder) * self.failures_per_level
+
+    def day_cost(self, day: int) -> float:
+        with self._lock:
+            return sum(level.cost for level in self.levels if level.day == day)
+
+    def exhausted(self, day: int) -> Optional[str]:
+        """Why the day has to stop (deadline passed or budget spent), or None if it can go on."""
+        with self._lock:
+            elapsed = time.perf_counter() - self._day_started.get(day, time.perf_counter())
+        if self.day_deadline is not None and elapsed >= self.day_deadline:
+            return f"the {self.day_deadline:.0f}s deadline for day {day} has passed ({elapsed:.0f}s spent)"
+        cost = self.day_cost(day)
+        if self.day_budget is not None and cost >= self.day_budget:
+            return f"the ${self.day_budget:g} budget for day {day} is spent (${cost:.4f})"
+        return None
+
+    def report(self) -> str:
+        """Time and cost spent at each level, per day and part."""
+        header = f"{'Day':<5}{'Part':<6}{'Level':<7}{'Model':<36}{'Attempts':>9}{'Time':>10}{'Cost':>10}  Solved"
+        lines = [header, "-" * len(header)]
+        with self._lock:
+            levels = sorted(self.levels, key=lambda level: (level.day, level.part))
+        rungs = {(provider.value, model_name): i + 1 for i, (provider, model_name) in enumerate(self.ladder)}
+        for level in levels:
+            lines.append(f"{level.day:<5}{level.part:<6}{rungs.get((level.provider, level.model), '-'):<7}"
+                         f"{level.provider + ' - ' + level.model:<36}{level.attempts:>9}{level.duration:>9.1f}s"
+                         f"{level.cost:>10.4f}  {'yes' if level.solved else 'no'}")
+        lines.append("-" * len(header))
+        for day in sorted({level.day for level in levels}):
+            day_levels = [level for level in levels if level.day == day]
+            lines.append(f"Day {day}: {sum(level.duration for level in day_levels):.1f}s, "
+                         f"${sum(level.cost for level in day_levels):.4f}")
+        return "\n".join(lines)
+
+
+_environment_loaded = False
+
+
+def load_environment():
+    """Load environment variables (API keys) and debug settings, once."""
+    global _environment_loaded
+    if _environment_loaded:
+        return
+    _environment_loaded = True
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    # Full langchain tracing dumps every prompt to the console, so it's opt-in (the ledger covers usage)
+    if os.getenv("AOC_LANGCHAIN_DEBUG"):
+        from langchain_core.globals import set_debug
+        set_debug(True)
+
+
+def create_llm(provider: ModelProvider, model_name: str, clients: Optional[SharedClients] = None) -> BaseChatModel:
+    """
+    Create the chat model for a provider, importing only that provider's integration.
+
+    Args:
+        provider: The model provider
+        model_name: The model to use
+        clients: Shared HTTP clients to make the calls with (otherwise the integration creates its own)
+    """
+    load_environment()
+    if provider == ModelProvider.OPENAI:
+        from langchain_openai import ChatOpenAI
+        if clients is None:
+            return ChatOpenAI(model=model_name, stream_usage=True)
+        return ChatOpenAI(model=model_name, stream_usage=True,
+                          http_client=clients.http_client, http_async_client=clients.http_async_client)
+    elif provider == ModelProvider.ANTHROPIC:
+        if clients is None:
+            from langchain_anthropic import ChatAnthropic
+            return ChatAnthropic(model=model_name)
+        from aoc_client_pool import pooled_chat_anthropic_class
+        return pooled_chat_anthropic_class()(model=model_name, shared_clients=clients)
+    elif provider == ModelProvider.LOCAL:
+        # The local client keeps its own pool of keep-alive connections
+        from aoc_local_llm import DEFAULT_LOCAL_BASE_URL, ChatLocal
+        return ChatLocal(model=model_name, base_url=os.getenv("AOC_LOCAL_BASE_URL", DEFAULT_LOCAL_BASE_URL))
+    else:
+        raise ValueError(f"Unsupported model provider: {provider}")
 
 
 class AoCLLMSolver:
@@ -27,16 +212,37 @@ class AoCLLMSolver:
                  part: int,
                  provider: ModelProvider = ModelProvider.OPENAI,
                  model_name: str = "gpt-4",
-                 part1_solution_path: Optional[Path] = None):
+                 part1_solution_path: Optional[Path] = None,
+                 llm: Optional[BaseChatModel] = None,
+                 cache: Optional[LLMResponseCache] = None,
+                 input_token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET,
+                 ledger: Optional[CallLedger] = None,
+                 streaming: bool = False,
+                 rate_limiter: Optional[ProviderRateLimiter] = None,
+                 compaction: Optional[CompactionPolicy] = None,
+                 repair_mode: bool = False,
+                 attempt_index: Optional[AttemptIndex] = None):
         """
         Initialize the solver with specified model configuration.
 
         Args:
             day: Day number of the puzzle
             part: Part number of the puzzle (1 or 2)
-            provider: The model provider to use (openai or anthropic)
+            provider: The model provider to use (openai, anthropic or local)
             model_name: The specific model to use
             part1_solution_path: Optional path to part 1 solution file (required for part 2)
+            llm: Optional chat model to use instead of the provider's (e.g. a local stub for offline runs)
+            cache: Optional response cache, so replaying the same conversation costs nothing
+            input_token_budget: Roughly how many prompt tokens the input sample may use (None sends it all)
+            ledger: Where to record tokens, latency and cost of each call (defaults to .aoc/ledger.jsonl)
+            streaming: Write solutions to disk as they stream in and stop generating as soon as
+                the response turns into prose or stops compiling
+            rate_limiter: Paces calls and retries rate limit errors (defaults to the provider's shared one)
+            compaction: How previous attempts are condensed in the chat history (defaults to keeping
+                only the latest attempt in full and summarising the rest)
+            repair_mode: Ask for SEARCH/REPLACE edits to the last attempt after feedback instead of
+                a whole new program, falling back to full regeneration if they don't apply
+            attempt_index: Where saved attempts and their runs are recorded (defaults to .aoc/attempts.sqlite)
         """
         self.day = day
         self.part = part
@@ -44,16 +250,26 @@ class AoCLLMSolver:
         self.model_name = model_name
         self.attempt_number = 1
 
-        # Initialize the appropriate LLM based on provider
-        if provider == ModelProvider.OPENAI:
-            self.llm = ChatOpenAI(model=model_name)
-        elif provider == ModelProvider.ANTHROPIC:
-            self.llm = ChatAnthropic(model=model_name)
-        else:
+        # The LLM for the provider is created on first use (see the llm property)
+        if llm is None and provider not in list(ModelProvider):
             raise ValueError(f"Unsupported model provider: {provider}")
-
-        self.output_parser = StrOutputParser()
+        self._llm = llm
+
+        self.cache = cache
+        self.input_token_budget = input_token_budget
+        self.ledger = ledger or CallLedger()
+        self.attempt_index = attempt_index or AttemptIndex()
+        self.streaming = streaming
+        self.rate_limiter = rate_limiter or get_rate_limiter(provider.value)
+        self.compaction = compaction or CompactionPolicy()
+        self.repair_mode = repair_mode
+        if repair_mode and self.compaction.keep_full == 0:
+            raise ValueError("Repair mode needs the latest attempt in the chat history (keep_full of at least 1)")
+        self.attempts: list[AttemptRecord] = []
         self.chat_history = []
+        self.history_tokens_saved = 0
+        # What this solver's calls have cost so far, in USD
+        self.cost = 0.0
 
         # Create base directory structure
         self.base_dir = Path(__file__).parent.resolve()
@@ -67,6 +283,27 @@ class AoCLLMSolver:
                 raise ValueError("Part 1 solution path is required when solving part 2")
             self.part1_solution = self.load_solution(part1_solution_path)
 
+    @property
+    def llm(self) -> BaseChatModel:
+        if self._llm is None:
+            # Every solver for the same provider and model shares one chat model and its connection pool
+            from aoc_client_pool import get_shared_llm
+            self._llm = get_shared_llm(self.provider.value, self.model_name,
+                                       lambda clients: create_llm(self.provider, self.model_name, clients))
+        return self._llm
+
+    def switch_model(self, provider: ModelProvider, model_name: str):
+        """Carry on with another model, keeping the attempts so far and the chat history."""
+        self.provider = provider
+        self.model_name = model_name
+        self._llm = None
+        self.rate_limiter = get_rate_limiter(provider.value)
+
+    @cached_property
+    def output_parser(self) -> StrOutputParser:
+        from langchain_core.output_parsers import StrOutputParser
+        return StrOutputParser()
+
     def load_solution(self, solution_path: Path) -> str:
         """Load a solution from a file."""
         if not solution_path.exists():
@@ -75,15 +312,21 @@ class AoCLLMSolver:
         with open(solution_path, "r") as f:
             return f.read()
 
-    def read_puzzle_description(self) -> str:
-        """Read the puzzle description from the corresponding day's folder."""
-        description_path = self.day_dir / "input" / f"description_part{self.part}.txt"
+    def read_puzzle_description(self, part: Optional[int] = None, new_text_only: bool = False) -> str:
+        """
+        Read the puzzle description (for this part unless given) from the corresponding day's folder.
+
+        Descriptions are parsed once and cached (see aoc_description.py). With new_text_only a
+        part 2 description is cut down to what comes after "--- Part Two ---", as part 1 is
+        already in the prompt.
+        """
+        description_path = self.day_dir / "input" / f"description_part{part or self.part}.txt"
 
         if not description_path.exists():
             raise FileNotFoundError(f"No description found for day {self.day} at {description_path}")
 
-        with open(description_path, "r") as f:
-            return f.read()
+        parsed = get_description_cache().load(description_path)
+        return parsed.new_text if new_text_only else parsed.text
 
     def read_puzzle_input(self) -> str:
         """Read the puzzle input from the corresponding day's folder."""
@@ -95,10 +338,33 @@ class AoCLLMSolver:
         with open(input_path, "r") as f:
             return f.read()
 
-    def save_solution(self, solution: str) -> Path:
+    def read_puzzle_input_sample(self) -> str:
+        """Read the puzzle input, reduced to a sample and summary that fit the prompt token budget."""
+        puzzle_input = self.read_puzzle_input()
+        if self.input_token_budget is None:
+            return puzzle_input
+        return sample_input(puzzle_input, self.input_token_budget)
+
+    @property
+    def model_suffix(self) -> str:
+        # Local model names can contain ':' and '.' (e.g. qwen2.5-coder:7b)
+        return f"_{self.provider.value}_{re.sub(r'[^0-9A-Za-z_]', '_', self.model_name)}"
+
+    def solution_path(self, attempt_number: Optional[int] = None) -> Path:
+        """The path a solution attempt is saved to."""
+        attempt_number = attempt_number or self.attempt_number
+        return self.day_dir / f"solution_part{self.part}_try{attempt_number}{self.model_suffix}.py"
+
+    def last_saved_attempt(self) -> int:
+        """The highest attempt number already saved for this part and model (0 if there are none)."""
+        pattern = re.compile(rf"solution_part{self.part}_try(\d+){re.escape(self.model_suffix)}\.py")
+        attempts = [int(match.group(1)) for path in self.day_dir.glob(f"solution_part{self.part}_try*.py")
+                    if (match := pattern.fullmatch(path.name))]
+        return max(attempts, default=0)
+
+    def save_solution(self, solution: str, attempt_number: Optional[int] = None) -> Path:
         """Save the solution to a file with attempt number and return the path."""
-        model_suffix = f"_{self.provider.value}_{self.model_name.replace('-', '_')}"
-        solution_path = self.day_dir / f"solution_part{self.part}_try{self.attempt_number}{model_suffix}.py"
+        solution_path = self.solution_path(attempt_number)
 
         solution_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -107,79 +373,227 @@ class AoCLLMSolver:
             f.flush()
             os.fsync(f.fileno())
 
+        self.attempt_index.record_saved(solution_path, solution, self.day, self.part,
+                                        attempt_number or self.attempt_number, self.provider.value, self.model_name)
         return solution_path
 
-    def generate_solution(self) -> str:
-        """Generate a Python solution using the LLM."""
-        print(f"\nGenerating solution attempt #{self.attempt_number} using {self.provider.value} - {self.model_name}")
-        description = self.read_puzzle_description()
-        sample_input = self.read_puzzle_input()
+    def build_messages(self, request: Optional[str] = None) -> list[BaseMessage]:
+        """
+        Build the full message list for the current attempt.
 
-        escaped_sample_input = sample_input.replace("{", "{{").replace("}", "}}")
+        The messages are laid out so the large static parts form a byte-identical prefix
+        across attempts, and between part 1 and part 2 of the same day, letting providers
+        reuse their prompt cache: system message, then the input sample and part 1
+        description, then (for part 2) the part 1 solution and part 2 description, and only
+        then the attempt-specific history and request.
 
-        # Create system message that won't be affected by template variables
-        system_message = """You are an expert Python programmer helping to solve Advent of Code puzzles.
-            Generate a complete Python solution for the given puzzle description.
-            The solution should:
-            1. Be well-commented and clearly explain the approach
-            2. Include proper error handling
-            3. Be efficient and follow Python best practices
-            4. Include type hints where appropriate
-            5. Parse the input file correctly from 'input/input.txt' relative to the script's location
-            6. Print the final answer
+        Args:
+            request: The final instruction (defaults to asking for a solution to this part)
+        """
+        from langchain_core.messages import HumanMessage, SystemMessage
 
-            Important: The input file is located at 'input/input.txt' relative to the script.
-            Your solution should use this path to read the input file.
+        messages = [
+            SystemMessage(content=SYSTEM_MESSAGE),
+            HumanMessage(content=self.cacheable(f"""Here is a sample of the input format:
 
-            Return only the Python code, no explanations before or after."""
+{self.read_puzzle_input_sample()}
 
-        messages = [("system", system_message)]
+Here is the puzzle description for Part 1:
+{self.read_puzzle_description(part=1)}"""))
+        ]
 
         if self.part == 2 and self.part1_solution:
-            # Double-escape any curly braces in the solution code
-            escaped_solution = self.part1_solution.replace("{", "{{").replace("}", "}}")
-            messages.append(("user", f"""Here is the working solution for Part 1:
-            ```python
-            {escaped_solution}
-            ```
-
-            Now, here is Part 2's description (including Part 1 for extra context):
-            {description}
-
-            Here is a sample of the input format:
-            
-            {escaped_sample_input}
-
-            Please modify the Part 1 solution to solve Part 2. 
-            Modify the solution you had for Part 1 to produce the result for both parts, ideally printing both parts.
-            Remember to clearly indicate the Part 2 modifications in the comments."""))
-        else:
-            messages.append(("user", f"""Here is the puzzle description:
-            {description}
+            messages.append(HumanMessage(content=self.cacheable(f"""Here is the working solution for Part 1:
+```python
+{self.part1_solution}
+```
+
+Now, here is Part 2's description:
+{self.read_puzzle_description(new_text_only=True)}
+
+Please modify the Part 1 solution to solve Part 2.
+Modify the solution you had for Part 1 to produce the result for both parts, ideally printing both parts.
+Remember to clearly indicate the Part 2 modifications in the comments.""")))
+
+        messages.extend(self.chat_history)
+        messages.append(HumanMessage(
+            content=request or f"Please generate a Python solution to solve Part {self.part} of this puzzle."))
+        return messages
+
+    def cacheable(self, text: str) -> str | list[dict]:
+        """Mark the end of a static prompt section as a cache breakpoint where the provider needs it."""
+        if self.provider != ModelProvider.ANTHROPIC:
+            # OpenAI caches matching prefixes automatically
+            return text
+        return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+    def cache_key(self, messages: list[BaseMessage], variant: int = 0) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return self.cache.make_key(self.provider.value, self.model_name, messages, variant)
+
+    def generate_solution(self, variant: int = 0, request: Optional[str] = None) -> str:
+        """Generate a Python solution (or the response to a custom request) using the LLM."""
+        print(f"\nGenerating solution attempt #{self.attempt_number} using {self.provider.value} - {self.model_name}")
+        messages = self.build_messages(request)
+
+        key = self.cache_key(messages, variant)
+        if key and (cached := self.cache.get(key)) is not None:
+            return cached
 
-            Here is a sample of the input format:
-            
-            {escaped_sample_input}"""))
+        # Only complete programs are streamed to the solution file
+        stream_to_file = self.streaming and request is None
+        solution = self.rate_limiter.run(
+            lambda: self.stream_solution(messages, self.attempt_number, stream_to_file),
+            self.estimate_request_tokens(messages)
+        )
+        if key:
+            self.cache.put(key, solution)
+        return solution
+
+    async def agenerate_solution(self, attempt_number: Optional[int] = None, variant: int = 0) -> str:
+        """Generate a Python solution using the LLM without blocking the event loop."""
+        attempt_number = attempt_number or self.attempt_number
+        print(f"\nGenerating solution attempt #{attempt_number} using {self.provider.value} - {self.model_name}")
+        messages = self.build_messages()
+
+        key = self.cache_key(messages, variant)
+        if key and (cached := self.cache.get(key)) is not None:
+            return cached
+
+        solution = await self.rate_limiter.arun(
+            lambda: self.astream_solution(messages, attempt_number, self.streaming),
+            self.estimate_request_tokens(messages)
+        )
+        if key:
+            self.cache.put(key, solution)
+        return solution
+
+    @staticmethod
+    def estimate_request_tokens(messages: list[BaseMessage]) -> int:
+        """Rough prompt plus completion size of a request, for tokens-per-minute pacing."""
+        return sum(estimate_tokens(str(message.content)) for message in messages) + EXPECTED_COMPLETION_TOKENS
+
+    def stream_solution(self, messages: list[BaseMessage], attempt_number: int, stream_to_file: bool = False) -> str:
+        """Stream a single completion, recording it in the ledger."""
+        writer = SolutionStreamWriter(self.solution_path(attempt_number)) if stream_to_file else None
+        start = time.perf_counter()
+        time_to_first_token = None
+        response = None
+        stream = self.llm.stream(messages)
+        for chunk in stream:
+            if time_to_first_token is None:
+                time_to_first_token = time.perf_counter() - start
+            response = chunk if response is None else response + chunk
+            if writer and not writer.feed(self.output_parser.invoke(chunk)):
+                stream.close()
+                break
 
-        messages.extend([
-            MessagesPlaceholder(variable_name="chat_history"),
-            ("user", f"Please generate a Python solution to solve Part {self.part} of this puzzle.")
-        ])
+        solution = self.finish_stream(writer, response)
+        self.record_call(attempt_number, messages, response, time_to_first_token, time.perf_counter() - start)
+        return solution
+
+    async def astream_solution(self,
+                               messages: list[BaseMessage],
+                               attempt_number: int,
+                               stream_to_file: bool = False) -> str:
+        """Stream a single completion without blocking the event loop, recording it in the ledger."""
+        writer = SolutionStreamWriter(self.solution_path(attempt_number)) if stream_to_file else None
+        start = time.perf_counter()
+        time_to_first_token = None
+        response = None
+        stream = self.llm.astream(messages)
+        async for chunk in stream:
+            if time_to_first_token is None:
+                time_to_first_token = time.perf_counter() - start
+            response = chunk if response is None else response + chunk
+            if writer and not writer.feed(self.output_parser.invoke(chunk)):
+                await stream.aclose()
+                break
 
-        prompt = ChatPromptTemplate.from_messages(messages)
-        chain = prompt | self.llm | self.output_parser
-        return chain.invoke({"chat_history": self.chat_history})
+        solution = self.finish_stream(writer, response)
+        self.record_call(attempt_number, messages, response, time_to_first_token, time.perf_counter() - start)
+        return solution
+
+    def finish_stream(self, writer: Optional[SolutionStreamWriter], response: Optional[BaseMessageChunk]) -> str:
+        """Turn a finished (or aborted) stream into the solution text."""
+        if response is None:
+            # The stream ended without a single chunk; an empty solution fails like any other attempt
+            print("\nThe model returned an empty response")
+        if writer is None:
+            return self.output_parser.invoke(response) if response is not None else ""
+
+        solution = writer.close()
+        if writer.abort_reason:
+            print(f"\nStopped generating early: {writer.abort_reason}")
+        return solution
+
+    def record_call(self,
+                    attempt_number: int,
+                    messages: list[BaseMessage],
+                    response: Optional[BaseMessageChunk],
+                    time_to_first_token: Optional[float],
+                    latency: float):
+        """Append a call's token usage, timings and cost to the ledger."""
+        usage = getattr(response, "usage_metadata", None)
+        cached_prompt_tokens = cache_write_tokens = 0
+        if usage:
+            prompt_tokens, completion_tokens = usage["input_tokens"], usage["output_tokens"]
+            input_details = usage.get("input_token_details") or {}
+            cached_prompt_tokens = input_details.get("cache_read") or 0
+            cache_write_tokens = input_details.get("cache_creation") or 0
+        else:
+            # Not every model reports usage (e.g. local stubs), so fall back to an estimate
+            prompt_tokens = sum(estimate_tokens(str(message.content)) for message in messages)
+            completion_tokens = estimate_tokens(str(response.content)) if response is not None else 0
+
+        cost = estimate_cost(self.model_name, prompt_tokens, completion_tokens, cached_prompt_tokens,
+                             cache_write_tokens)
+        self.cost += cost
+        self.ledger.append(LedgerRecord(
+            day=self.day,
+            part=self.part,
+            attempt=attempt_number,
+            provider=self.provider.value,
+            model=self.model_name,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            # A stream without chunks never had a first token, the whole call is the best stand-in
+            time_to_first_token=latency if time_to_first_token is None else time_to_first_token,
+            latency=latency,
+            cached_prompt_tokens=cached_prompt_tokens,
+            cache_write_tokens=cache_write_tokens,
+            cost=cost,
+            estimated_tokens=not usage,
+            history_tokens_saved=self.history_tokens_saved
+        ))
 
     def provide_feedback(self, solution: str, feedback: str) -> str:
         """Provide feedback about a solution attempt and get an improved version."""
-        self.chat_history.extend([
-            AIMessage(content=f"Here was my solution attempt #{self.attempt_number}:\n```python\n{solution}\n```"),
-            HumanMessage(
-                content=f"This solution didn't work. Here's what happened: {feedback}\nPlease provide an improved solution that addresses these issues.")
-        ])
+        from langchain_core.messages import AIMessage, HumanMessage
+
+        self.attempts.append(AttemptRecord(self.attempt_number, solution, feedback))
+        history, self.history_tokens_saved = compact_history(self.attempts, self.compaction)
+        self.chat_history = [
+            AIMessage(content=content) if role == "ai" else HumanMessage(content=content)
+            for role, content in history
+        ]
+        if self.history_tokens_saved:
+            print(f"\nCompacted chat history, saving ~{self.history_tokens_saved} prompt tokens")
 
         self.attempt_number += 1
-        return self.generate_solution()
+        if not self.repair_mode:
+            return self.generate_solution()
+
+        edits = self.generate_solution(request=EDIT_FORMAT_INSTRUCTIONS.format(attempt_number=self.attempt_number - 1))
+        try:
+            repaired = apply_edits(solution, edits)
+        except PatchError as e:
+            print(f"\nCouldn't apply the suggested edits ({e}), regenerating the whole solution instead")
+            return self.generate_solution()
+
+        print(f"\nRepaired attempt #{self.attempt_number - 1} by applying the suggested edits")
+        return repaired
 
 
 def solve_puzzle(
@@ -187,13 +601,58 @@ def solve_puzzle(
         part: int,
         provider: ModelProvider = ModelProvider.OPENAI,
         model_name: str = "gpt-4",
-        part1_solution_path: Optional[Path] = None
-):
+        part1_solution_path: Optional[Path] = None,
+        max_attempts: int = 10,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB,
+        cpu_time_limit: Optional[float] = DEFAULT_CPU_TIME_SECONDS,
+        cache: Optional[LLMResponseCache] = None,
+        streaming: bool = False,
+        rejected_solution: Optional[tuple[str, str]] = None,
+        cancel: Optional[threading.Event] = None,
+        use_examples: bool = True,
+        cascade: Optional[CascadePolicy] = None,
+        repair_mode: bool = False
+) -> Optional[Path]:
+    """
+    Generate and verify solutions until one works.
+
+    When the day has a stored answer (input/answer_partN.txt) each attempt is run
+    automatically and failures are fed straight back to the LLM. Otherwise the user
+    is asked for feedback after every attempt. Runs that go over the time budget
+    are profiled and the hot functions are included in the feedback.
+
+    Attempts are first run against the worked examples from the description
+    (input/examples_partN.json, extracted on first use), and only attempts that
+    pass them are run on the real input or shown to the user.
+
+    Args:
+        rejected_solution: A (solution, feedback) pair for a solution that was rejected
+            after it had verified, so the first attempt starts by fixing it
+        cancel: Stops the loop before the next LLM call, or the next attempt is saved or run, when set
+        use_examples: Check attempts against the description's examples before the real input
+        cascade: Escalate through a ladder of models instead of using provider/model_name,
+            within a per-day deadline and budget
+        repair_mode: Ask for SEARCH/REPLACE edits to the last attempt after feedback instead
+            of a whole new program
+
+    Returns:
+        The path of the working solution, or None if none was confirmed
+    """
     # Validate part number and solution path requirements
     if part not in [1, 2]:
         raise ValueError("Part must be either 1 or 2")
     if part == 2 and not part1_solution_path:
         raise ValueError("Part 1 solution path is required when solving part 2")
+    if cascade:
+        cascade.start_day(day)
+        if reason := cascade.exhausted(day):
+            print(f"\nNot starting day {day} part {part}: {reason}")
+            return None
+        provider, model_name = cascade.ladder[0]
+        if max_attempts < cascade.attempts_to_top:
+            print(f"\nWarning: max_attempts={max_attempts} cuts the cascade short, the ladder needs "
+                  f"{cascade.attempts_to_top} attempts to give each model {cascade.failures_per_level}")
 
     try:
         solver = AoCLLMSolver(
@@ -201,7 +660,10 @@ def solve_puzzle(
             part=part,
             provider=provider,
             model_name=model_name,
-            part1_solution_path=part1_solution_path
+            part1_solution_path=part1_solution_path,
+            cache=cache,
+            streaming=streaming,
+            repair_mode=repair_mode
         )
     except FileNotFoundError as e:
         if part == 2:
@@ -217,10 +679,34 @@ def solve_puzzle(
                 print(f"\nError: No solutions found for day {day}. Please solve part 1 first.")
         raise
 
+    expected_answer = load_expected_answer(solver.day_dir, part)
+    if expected_answer is None:
+        print(f"\nNo stored answer for day {day} part {part}, falling back to manual feedback.")
+    examples = load_examples(solver.day_dir, part) if use_examples else []
+    if examples:
+        print(f"\nChecking attempts against {len(examples)} example(s) from the description first")
+
+    # Fingerprint -> (attempt number, printed answers, feedback) of every attempt that didn't work
+    seen_solutions: dict[str, tuple[int, Optional[list[str]], str]] = {}
+    level = cascade.enter_level(day, part, provider, model_name) if cascade else None
+    rung = level_failures = 0
+    level_start, level_cost_start = time.perf_counter(), 0.0
+
+    def close_level():
+        level.duration += time.perf_counter() - level_start
+        level.cost += solver.cost - level_cost_start
+
     try:
-        current_solution = solver.generate_solution()
+        if rejected_solution:
+            current_solution = solver.provide_feedback(*rejected_solution)
+        else:
+            current_solution = solver.generate_solution()
 
         while True:
+            if cancel and cancel.is_set():
+                print(f"\nDay {day} part {part} cancelled")
+                break
+
             print(f"\nGenerated Python Solution (Attempt #{solver.attempt_number}):")
             print("-" * 80)
             print(current_solution)
@@ -229,20 +715,228 @@ def solve_puzzle(
             solution_path = solver.save_solution(current_solution)
             print(f"\nSolution saved to: {solution_path}")
             print(f"To use this solution for part 2, use the path: {solution_path}")
-
-            print("\nPlease verify the solution has been saved and test it.")
-            feedback = input("Did this solution work? If not, please provide feedback (or 'exit' to quit): ")
-
-            if feedback.lower() == 'exit' or feedback.lower() == 'yes':
+            if level:
+                level.attempts += 1
+
+            # Attempts that only differ in names, comments or formatting get the earlier verdict straight away
+            solution_fingerprint = fingerprint(current_solution)
+            if duplicate := seen_solutions.get(solution_fingerprint):
+                print(f"\nAttempt #{solver.attempt_number} is identical to attempt #{duplicate[0]}, not running it again")
+                if solver.attempt_number >= max_attempts:
+                    print(f"\nGiving up after {max_attempts} attempts")
+                    break
+                feedback = duplicate_feedback(*duplicate)
+
+            elif (example_feedback := check_examples(solution_path, examples)) is not None:
+                print(f"\nAttempt #{solver.attempt_number} failed the examples, not running it on the real input")
+                if solver.attempt_number >= max_attempts:
+                    print(f"\nGiving up after {max_attempts} attempts")
+                    break
+                feedback = example_feedback
+                print(f"\nFeedback: {feedback}")
+                seen_solutions[solution_fingerprint] = (solver.attempt_number, None, feedback)
+
+            elif expected_answer is None:
+                print("\nPlease verify the solution has been saved and test it.")
+                feedback = input("Did this solution work? If not, please provide feedback (or 'exit' to quit): ")
+
+                if feedback.lower() == 'yes':
+                    if level:
+                        level.solved = True
+                    return solution_path
+                if feedback.lower() == 'exit':
+                    break
+                seen_solutions[solution_fingerprint] = (solver.attempt_number, None, feedback)
+            else:
+                result = run_solution(solution_path, expected_answer, timeout, memory_limit_mb, cpu_time_limit,
+                                      index=solver.attempt_index, pool=get_worker_pool())
+                print(f"\nRan in {result.duration:.2f}s ({result.cpu_time:.2f}s CPU, "
+                      f"{result.peak_memory_mb:.0f} MB peak) and printed: {result.answers}")
+
+                if result.correct:
+                    print(f"\nSolution verified on attempt #{solver.attempt_number}")
+                    if level:
+                        level.solved = True
+                    return solution_path
+                if solver.attempt_number >= max_attempts:
+                    print(f"\nGiving up after {max_attempts} attempts")
+                    break
+
+                feedback = result.feedback()
+                print(f"\nFeedback: {feedback}")
+                seen_solutions[solution_fingerprint] = (solver.attempt_number, result.answers, feedback)
+
+            if cascade:
+                close_level()
+                level_start, level_cost_start = time.perf_counter(), solver.cost
+                if reason := cascade.exhausted(day):
+                    print(f"\nStopping day {day} part {part}: {reason}")
+                    break
+                level_failures += 1
+                if level_failures >= cascade.failures_per_level and rung + 1 < len(cascade.ladder):
+                    rung, level_failures = rung + 1, 0
+                    provider, model_name = cascade.ladder[rung]
+                    print(f"\nEscalating to {provider.value} - {model_name} after "
+                          f"{cascade.failures_per_level} failed attempts with {solver.model_name}")
+                    solver.switch_model(provider, model_name)
+                    level = cascade.enter_level(day, part, provider, model_name)
+
+            # Cancelling while an attempt ran mustn't cost another LLM call
+            if cancel and cancel.is_set():
+                print(f"\nDay {day} part {part} cancelled")
                 break
-
             current_solution = solver.provide_feedback(current_solution, feedback)
 
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        if cache:
+            print(f"\n{cache.format_stats()}")
+        if cascade:
+            close_level()
+            print(f"\n{cascade.report()}")
+
+    return None
+
+
+async def race_candidates(
+        solvers: list[AoCLLMSolver],
+        candidates_per_solver: int,
+        verify: Callable[[Path], Awaitable[bool]]
+) -> Optional[Path]:
+    """
+    Request several candidates from each solver concurrently and keep the first verified one.
+
+    Candidates are saved and verified in the order they arrive. As soon as one passes
+    verification the remaining requests are cancelled. Candidates identical to an earlier
+    one (apart from names, comments and formatting) aren't verified again.
+
+    Args:
+        solvers: Solvers to request candidates from (one per provider/model)
+        candidates_per_solver: Number of candidates to request from each solver
+        verify: Coroutine called with each saved solution path, returning whether it is correct
+
+    Returns:
+        The path of the first verified solution, or None if no candidate passed
+    """
+    async def attempt(solver: AoCLLMSolver, attempt_number: int, variant: int) -> Optional[Path]:
+        solution = await solver.agenerate_solution(attempt_number, variant)
+        solution_path = solver.save_solution(solution, attempt_number)
+        print(f"\nCandidate saved to: {solution_path}")
+
+        # If the first copy of this solution passes, the race is won by that one anyway
+        solution_fingerprint = fingerprint(solution)
+        if solution_fingerprint in seen_solutions:
+            print(f"\n{solution_path.name} is identical to {seen_solutions[solution_fingerprint].name}, skipping it")
+            return None
+        seen_solutions[solution_fingerprint] = solution_path
+        return solution_path if await verify(solution_path) else None
+
+    seen_solutions: dict[str, Path] = {}
+
+    tasks = []
+    for solver in solvers:
+        first_attempt = solver.attempt_number
+        for i in range(candidates_per_solver):
+            tasks.append(asyncio.create_task(attempt(solver, first_attempt + i, i)))
+        solver.attempt_number = first_attempt + candidates_per_solver - 1
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                solution_path = await next_done
+            except Exception as e:
+                print(f"Candidate failed: {e}")
+                continue
+            if solution_path:
+                return solution_path
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def solve_puzzle_async(
+        day: int,
+        part: int,
+        models: list[tuple[ModelProvider, str]],
+        candidates_per_model: int = 3,
+        part1_solution_path: Optional[Path] = None,
+        verify: Optional[Callable[[Path], Awaitable[bool]]] = None,
+        cache: Optional[LLMResponseCache] = None
+) -> Optional[Path]:
+    """
+    Solve a puzzle by racing several candidates from one or more models at once.
+
+    Args:
+        day: Day number of the puzzle
+        part: Part number of the puzzle (1 or 2)
+        models: (provider, model_name) pairs to request candidates from
+        candidates_per_model: Number of concurrent candidates per model
+        part1_solution_path: Optional path to part 1 solution file (required for part 2)
+        verify: Coroutine deciding whether a saved solution is correct (defaults to running it
+            against the stored answer, or asking when there isn't one)
+        cache: Optional response cache shared by every candidate
+
+    Returns:
+        The path of the first verified solution, or None if no candidate passed
+    """
+    if part not in [1, 2]:
+        raise ValueError("Part must be either 1 or 2")
+    if part == 2 and not part1_solution_path:
+        raise ValueError("Part 1 solution path is required when solving part 2")
+
+    day_dir = Path(__file__).parent.resolve() / f"day{day}"
+    expected_answer = load_expected_answer(day_dir, part)
+    examples = load_examples(day_dir, part)
+    attempt_index = AttemptIndex()
+
+    if verify is None and expected_answer is not None:
+        async def verify(solution_path: Path) -> bool:
+            if (example_feedback := await asyncio.to_thread(check_examples, solution_path, examples)) is not None:
+                print(f"\n{solution_path.name} failed the examples: {example_feedback}")
+                return False
+            result = await asyncio.to_thread(run_solution, solution_path, expected_answer,
+                                            index=attempt_index, pool=get_worker_pool())
+            print(f"\n{solution_path.name} ran in {result.duration:.2f}s and printed: {result.answers}")
+            return bool(result.correct)
+
+    elif verify is None:
+        prompt_lock = asyncio.Lock()
+
+        async def verify(solution_path: Path) -> bool:
+            # Don't bother the user with candidates that can't even do the examples
+            if (example_feedback := await asyncio.to_thread(check_examples, solution_path, examples)) is not None:
+                print(f"\n{solution_path.name} failed the examples: {example_feedback}")
+                return False
+            # Only ask about one candidate at a time so prompts don't interleave
+            async with prompt_lock:
+                answer = await asyncio.to_thread(input, f"Did {solution_path.name} work? (yes/no): ")
+            return answer.lower() == 'yes'
+
+    solvers = [
+        AoCLLMSolver(
+            day=day,
+            part=part,
+            provider=provider,
+            model_name=model_name,
+            part1_solution_path=part1_solution_path,
+            cache=cache,
+            attempt_index=attempt_index
+        )
+        for provider, model_name in models
+    ]
+    try:
+        return await race_candidates(solvers, candidates_per_model, verify)
+    finally:
+        if cache:
+            print(f"\n{cache.format_stats()}")
 
 
 if __name__ == "__main__":
+    # To solve a whole range of days unattended use aoc_batch.py instead, e.g.
+    #   python aoc_batch.py --days 1-25 --concurrency 4
     # Example usage with different models:
     base_dir = Path(__file__).parent.resolve()
     day = 11
@@ -250,6 +944,13 @@ if __name__ == "__main__":
     # Solve Part 1
     #solve_puzzle(day=day, part=part, provider=ModelProvider.OPENAI, model_name="gpt-4o")
 
+    # Race several candidates from multiple models at once
+    #asyncio.run(solve_puzzle_async(day=day, part=1, models=[(ModelProvider.OPENAI, "gpt-4o"), (ModelProvider.ANTHROPIC, "claude-3-5-sonnet-latest")]))
+
+    # Generate candidates for free with a local model behind an OpenAI-compatible server (AOC_LOCAL_BASE_URL),
+    # or with no model at all against the stand-in: python aoc_local_server.py
+    #asyncio.run(solve_puzzle_async(day=day, part=1, models=[(ModelProvider.LOCAL, "qwen2.5-coder:7b")], candidates_per_model=8))
+
     # Solve Part 2 (after completing part 1)
     solve_puzzle(
          day=day,
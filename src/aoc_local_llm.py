@@ -0,0 +1,265 @@
+import asyncio
+import http.client
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+# llama.cpp's server default; ollama serves the same API at http://localhost:11434/v1
+DEFAULT_LOCAL_BASE_URL = "http://localhost:8080/v1"
+
+# How long the first of several identical requests waits for the others to join its batch
+DEFAULT_BATCH_WINDOW_SECONDS = 0.05
+
+ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+
+class LocalServerError(Exception):
+    """Raised when the local inference server returns an error response."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Error code: {status_code} - {message}")
+        self.status_code = status_code
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP connections to a single server, shared between threads.
+
+    Connections are handed out last-in first-out so the warmest one is reused, and at
+    most max_connections are open at once.
+    """
+
+    def __init__(self, base_url: str, max_connections: int = 8, timeout: float = 600.0):
+        url = urlsplit(base_url)
+        if url.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme for local server: {base_url}")
+        self.scheme = url.scheme
+        self.host = url.hostname
+        self.port = url.port
+        self.path = url.path.rstrip("/")
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.requests_sent = 0
+
+    def _connect(self) -> http.client.HTTPConnection:
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        with self._lock:
+            self.connections_opened += 1
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method: str, path: str, body: Optional[dict] = None) -> tuple[int, bytes]:
+        """
+        Send a request on a pooled connection.
+
+        Returns:
+            The status code and body of the response
+        """
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+        with self._slots:
+            try:
+                connection = self._idle.get_nowait()
+                reused = True
+            except queue.Empty:
+                connection = self._connect()
+                reused = False
+
+            try:
+                try:
+                    connection.request(method, self.path + path, payload, headers)
+                    response = connection.getresponse()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    if not reused:
+                        raise
+                    # The server closed an idle connection, so retry once on a fresh one
+                    connection.close()
+                    connection = self._connect()
+                    connection.request(method, self.path + path, payload, headers)
+                    response = connection.getresponse()
+                data = response.read()
+            except Exception:
+                connection.close()
+                raise
+
+            with self._lock:
+                self.requests_sent += 1
+            if response.will_close:
+                connection.close()
+            else:
+                self._idle.put(connection)
+            return response.status, data
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class LocalInferenceClient:
+    """
+    Client for an OpenAI-compatible chat completions server running locally.
+
+    Identical requests that arrive within batch_window seconds of each other (e.g. the
+    candidates of a race) are merged into one request for n completions, so the server
+    processes the shared prompt once. Servers that return fewer choices than asked for
+    (llama.cpp and ollama ignore n) get the remaining requests individually.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_LOCAL_BASE_URL,
+                 max_connections: int = 8,
+                 batch_window: float = DEFAULT_BATCH_WINDOW_SECONDS):
+        self.pool = ConnectionPool(base_url, max_connections)
+        self.batch_window = batch_window
+        self._batches: dict[str, list[Future]] = {}
+        self._lock = threading.Lock()
+        self.batches_sent = 0
+        self.completions_received = 0
+
+    def create_completions(self, body: dict) -> dict:
+        """Send a chat completions request, returning the parsed response."""
+        status, data = self.pool.request("POST", "/chat/completions", body)
+        if status != 200:
+            raise LocalServerError(status, data.decode(errors="replace")[:500])
+        return json.loads(data)
+
+    def complete(self, body: dict) -> tuple[dict, dict]:
+        """
+        Get a single completion, batching it with identical concurrent requests.
+
+        Returns:
+            The choice for this request and the token usage attributed to it
+        """
+        key = json.dumps(body, sort_keys=True)
+        future = Future()
+        with self._lock:
+            leader = key not in self._batches
+            batch = self._batches.setdefault(key, [])
+            batch.append(future)
+
+        if leader:
+            time.sleep(self.batch_window)
+            with self._lock:
+                del self._batches[key]
+            self._send_batch(body, batch)
+        return future.result()
+
+    def _send_batch(self, body: dict, futures: list[Future]):
+        pending = list(futures)
+        try:
+            while pending:
+                response = self.create_completions({**body, "n": len(pending)} if len(pending) > 1 else body)
+                choices = response.get("choices") or []
+                if not choices:
+                    raise LocalServerError(200, "response contained no choices")
+                usage = response.get("usage") or {}
+                with self._lock:
+                    self.batches_sent += 1
+                    self.completions_received += len(choices)
+
+                # The prompt was only processed once, so share its tokens between the choices
+                share = {"prompt_tokens": usage.get("prompt_tokens", 0) // len(choices),
+                         "completion_tokens": usage.get("completion_tokens", 0) // len(choices)}
+                for choice in choices[:len(pending)]:
+                    pending.pop(0).set_result((choice, share))
+        except Exception as e:
+            for future in pending:
+                future.set_exception(e)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "connections_opened": self.pool.connections_opened,
+                "requests_sent": self.pool.requests_sent,
+                "batches_sent": self.batches_sent,
+                "completions_received": self.completions_received
+            }
+
+
+_clients: dict[str, LocalInferenceClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_local_client(base_url: str = DEFAULT_LOCAL_BASE_URL) -> LocalInferenceClient:
+    """The process-wide client for a local server, so every solver shares its connections and batches."""
+    with _clients_lock:
+        if base_url not in _clients:
+            _clients[base_url] = LocalInferenceClient(base_url)
+        return _clients[base_url]
+
+
+def to_openai_messages(messages: list[BaseMessage]) -> list[dict]:
+    converted = []
+    for message in messages:
+        content = message.content
+        if isinstance(content, list):
+            # Drop provider-specific blocks (e.g. cache_control) and keep the text
+            content = "".join(block.get("text", "") if isinstance(block, dict) else str(block) for block in content)
+        converted.append({"role": ROLES.get(message.type, "user"), "content": content})
+    return converted
+
+
+class ChatLocal(BaseChatModel):
+    """
+    Chat model for an OpenAI-compatible local inference server (llama.cpp, ollama, vLLM...).
+
+    Requests go through the shared client for base_url, which keeps connections alive and
+    batches identical concurrent requests into a single round-trip.
+    """
+
+    model: str
+    base_url: str = DEFAULT_LOCAL_BASE_URL
+    temperature: float = 0.7
+    max_tokens: Optional[int] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "local"
+
+    @property
+    def client(self) -> LocalInferenceClient:
+        return get_local_client(self.base_url)
+
+    def _generate(self,
+                  messages: list[BaseMessage],
+                  stop: Optional[list[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None,
+                  **kwargs: Any) -> ChatResult:
+        body = {"model": self.model, "messages": to_openai_messages(messages), "temperature": self.temperature}
+        if self.max_tokens is not None:
+            body["max_tokens"] = self.max_tokens
+        if stop:
+            body["stop"] = stop
+
+        choice, usage = self.client.complete(body)
+        message = AIMessage(
+            content=choice["message"]["content"],
+            usage_metadata={
+                "input_tokens": usage["prompt_tokens"],
+                "output_tokens": usage["completion_tokens"],
+                "total_tokens": usage["prompt_tokens"] + usage["completion_tokens"]
+            }
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self,
+                         messages: list[BaseMessage],
+                         stop: Optional[list[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                         **kwargs: Any) -> ChatResult:
+        # Concurrent candidates each wait on a thread, which is what lets them join one batch
+        return await asyncio.to_thread(self._generate, messages, stop, **kwargs)
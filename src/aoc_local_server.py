@@ -0,0 +1,164 @@
+import argparse
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+# A harmless program in the shape the solver expects, for when no responses are given
+DEFAULT_RESPONSE = """from pathlib import Path
+
+
+def main():
+    lines = (Path(__file__).parent / "input" / "input.txt").read_text().splitlines()
+    print(len(lines))
+
+
+if __name__ == "__main__":
+    main()
+"""
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    A stand-in for a local OpenAI-compatible inference server, for running the LOCAL
+    provider (or ChatOpenAI pointed at it with OPENAI_BASE_URL) with no model or network.
+
+    Canned responses are cycled through in order, one per completion, and requests for
+    n completions are answered with n choices in a single response. It counts the
+    connections and requests it sees so connection reuse and batching can be checked.
+    """
+
+    daemon_threads = True
+
+    def __init__(self,
+                 address: tuple[str, int] = ("127.0.0.1", 8080),
+                 responses: Optional[list[str]] = None,
+                 delay: float = 0.0,
+                 supports_n: bool = True):
+        super().__init__(address, StandInHandler)
+        self.responses = responses or [DEFAULT_RESPONSE]
+        self.delay = delay
+        self.supports_n = supports_n
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def next_response(self) -> str:
+        with self._lock:
+            return self.responses[next(self._counter) % len(self.responses)]
+
+    def count(self, connections: int = 0, requests: int = 0):
+        with self._lock:
+            self.connections += connections
+            self.requests += requests
+
+    def start(self) -> "StandInServer":
+        """Serve on a background thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests
+    protocol_version = "HTTP/1.1"
+    server: StandInServer
+
+    def setup(self):
+        super().setup()
+        self.server.count(connections=1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_events(self, events: list[dict]):
+        data = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(data.encode())))
+        self.end_headers()
+        self.wfile.write(data.encode())
+
+    def do_GET(self):
+        self.server.count(requests=1)
+        if self.path == "/v1/models":
+            self.send_json(200, {"object": "list", "data": [{"id": "stand-in", "object": "model"}]})
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self):
+        self.server.count(requests=1)
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path != "/v1/chat/completions":
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        time.sleep(self.server.delay)
+        n = body.get("n", 1) if self.server.supports_n else 1
+        contents = [self.server.next_response() for _ in range(n)]
+        # Roughly 4 characters per token, like the solver's own estimates
+        prompt_tokens = sum(len(str(message.get("content", ""))) for message in body.get("messages", [])) // 4
+        completion_tokens = sum(len(content) for content in contents) // 4
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+
+        if body.get("stream"):
+            # Streamed as a single content chunk per choice, then the usage if it was asked for
+            chunk = {"object": "chat.completion.chunk", "created": int(time.time()), "model": body.get("model", "stand-in")}
+            events = [{**chunk, "choices": [{"index": i, "delta": {"role": "assistant", "content": content},
+                                             "finish_reason": "stop"}]}
+                      for i, content in enumerate(contents)]
+            if (body.get("stream_options") or {}).get("include_usage"):
+                events.append({**chunk, "choices": [], "usage": usage})
+            self.send_events(events)
+            return
+
+        self.send_json(200, {
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stand-in"),
+            "choices": [
+                {"index": i, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+                for i, content in enumerate(contents)
+            ],
+            "usage": usage
+        })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve canned completions on an OpenAI-compatible API")
+    parser.add_argument("responses", nargs="*", type=Path, help="Files whose contents are returned in turn")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before each response")
+    parser.add_argument("--no-n", action="store_true", help="Ignore n and return one choice, like llama.cpp")
+    args = parser.parse_args()
+
+    server = StandInServer((args.host, args.port),
+                           [path.read_text() for path in args.responses],
+                           args.delay,
+                           supports_n=not args.no_n)
+    print(f"Serving {len(server.responses)} canned response(s) at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,83 @@
+import re
+
+EDIT_FORMAT_INSTRUCTIONS = """Instead of rewriting the whole program, reply only with the edits needed to fix attempt #{attempt_number}, as one or more SEARCH/REPLACE blocks in exactly this format:
+
+<<<<<<< SEARCH
+lines copied exactly from the current solution
+=======
+the lines to replace them with
+>>>>>>> REPLACE
+
+Each SEARCH section must match the current solution exactly (including indentation) and only once, so include enough surrounding lines to make it unique. Don't include any other text."""
+
+EDIT_BLOCK_PATTERN = re.compile(
+    r"<<<<<<< SEARCH\n(?P<search>.*?)\n?=======\n(?P<replace>.*?)\n?>>>>>>> REPLACE",
+    re.DOTALL
+)
+
+
+class PatchError(Exception):
+    """Raised when edits can't be parsed, applied or produce invalid Python."""
+
+
+def parse_edits(response: str) -> list[tuple[str, str]]:
+    """Extract the (search, replace) pairs from an LLM response."""
+    edits = [(match["search"], match["replace"]) for match in EDIT_BLOCK_PATTERN.finditer(response)]
+    if not edits:
+        raise PatchError("the response contained no SEARCH/REPLACE blocks")
+    return edits
+
+
+def _find_by_stripped_lines(source_lines: list[str], search_lines: list[str]) -> list[int]:
+    """Find where the search lines occur in the source, ignoring trailing whitespace."""
+    search = [line.rstrip() for line in search_lines]
+    stripped = [line.rstrip() for line in source_lines]
+    return [i for i in range(len(stripped) - len(search) + 1) if stripped[i:i + len(search)] == search]
+
+
+def apply_edit(source: str, search: str, replace: str) -> str:
+    """Apply a single search/replace edit, which must match exactly one place."""
+    if not search.strip():
+        raise PatchError("an edit had an empty SEARCH section")
+
+    occurrences = source.count(search)
+    if occurrences == 1:
+        return source.replace(search, replace, 1)
+    if occurrences > 1:
+        raise PatchError(f"SEARCH section matched {occurrences} places:\n{search}")
+
+    # Models often get trailing whitespace wrong, so fall back to comparing stripped lines
+    source_lines = source.splitlines()
+    search_lines = search.splitlines()
+    matches = _find_by_stripped_lines(source_lines, search_lines)
+    if len(matches) != 1:
+        raise PatchError(f"SEARCH section matched {len(matches)} places:\n{search}")
+
+    start = matches[0]
+    patched = source_lines[:start] + replace.splitlines() + source_lines[start + len(search_lines):]
+    return "\n".join(patched) + ("\n" if source.endswith("\n") else "")
+
+
+def apply_edits(source: str, response: str) -> str:
+    """
+    Apply the SEARCH/REPLACE edits in an LLM response to a solution.
+
+    Args:
+        source: The solution being repaired
+        response: The LLM response containing the edits
+
+    Returns:
+        The patched solution
+
+    Raises:
+        PatchError: If the edits can't be parsed or applied, or the result doesn't compile
+    """
+    patched = source
+    for search, replace in parse_edits(response):
+        patched = apply_edit(patched, search, replace)
+
+    try:
+        compile(patched, "<patched solution>", "exec")
+    except SyntaxError as e:
+        raise PatchError(f"the patched solution doesn't compile: {e.msg} (line {e.lineno})") from e
+    return patched
@@ -0,0 +1,137 @@
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from aoc_attempt_index import AttemptIndex
+from aoc_executor import load_expected_answer, run_solution
+from aoc_llm_solver import ModelProvider, solve_puzzle
+
+BASE_DIR = Path(__file__).parent.resolve()
+
+
+@dataclass
+class RecheckResult:
+    """Outcome of re-running a verified solution several times."""
+    valid: bool
+    durations: list[float] = field(default_factory=list)
+    feedback: Optional[str] = None
+
+
+def recheck_solution(solution_path: Path,
+                     expected_answer: str,
+                     runs: int = 3,
+                     index: Optional[AttemptIndex] = None) -> RecheckResult:
+    """
+    Re-run a verified solution to make sure it is reliably correct, recording its run times.
+
+    A solution that only verified once (e.g. it depends on set ordering or randomness,
+    or only just made the time budget) is rejected with feedback for the LLM.
+    """
+    durations = []
+    for run in range(1, runs + 1):
+        result = run_solution(solution_path, expected_answer, index=index)
+        durations.append(result.duration)
+        if not result.correct:
+            return RecheckResult(False, durations, f"The solution printed the correct answer the first time, but on "
+                                                   f"re-run #{run} it failed. It must be deterministic and reliably "
+                                                   f"fast. {result.feedback()}")
+    return RecheckResult(True, durations)
+
+
+async def solve_day_pipelined(
+        day: int,
+        provider: ModelProvider = ModelProvider.OPENAI,
+        model_name: str = "gpt-4o",
+        max_attempts: int = 5,
+        recheck_runs: int = 3,
+        max_restarts: int = 2,
+        repair_mode: bool = False
+) -> tuple[Optional[Path], Optional[Path]]:
+    """
+    Solve both parts of a day, starting part 2 as soon as part 1 verifies.
+
+    Part 1 is re-checked in the background while part 2 is being generated from it. If
+    the re-check rejects part 1, part 2 is cancelled, part 1 is fixed using the re-check
+    feedback and part 2 is restarted from the new part 1.
+
+    Args:
+        day: The day to solve (needs input/answer_part1.txt for automated verification)
+        provider: The model provider to use
+        model_name: The specific model to use
+        max_attempts: Maximum attempts per part
+        recheck_runs: How many times the verified part 1 is re-run in the background
+        max_restarts: How many times part 1 may be invalidated before giving up
+        repair_mode: Ask for SEARCH/REPLACE edits to the last attempt after feedback
+
+    Returns:
+        The verified part 1 and part 2 solution paths (None where a part wasn't solved)
+    """
+    expected_answer = load_expected_answer(BASE_DIR / f"day{day}", 1)
+    if expected_answer is None:
+        raise ValueError(f"Pipelined mode needs a stored answer for day {day} part 1 (input/answer_part1.txt)")
+
+    start = time.perf_counter()
+    rejected_solution = None
+    for restart in range(max_restarts + 1):
+        part1_path = await asyncio.to_thread(
+            solve_puzzle, day=day, part=1, provider=provider, model_name=model_name,
+            max_attempts=max_attempts, rejected_solution=rejected_solution, repair_mode=repair_mode
+        )
+        if part1_path is None:
+            return None, None
+        part1_verified = time.perf_counter() - start
+        print(f"\nDay {day} part 1 verified after {part1_verified:.1f}s, starting part 2 while re-checking part 1")
+
+        cancel = threading.Event()
+        part2 = asyncio.create_task(asyncio.to_thread(
+            solve_puzzle, day=day, part=2, provider=provider, model_name=model_name,
+            part1_solution_path=part1_path, max_attempts=max_attempts, cancel=cancel, repair_mode=repair_mode
+        ))
+        recheck = await asyncio.to_thread(recheck_solution, part1_path, expected_answer, recheck_runs, AttemptIndex())
+        recheck_done = time.perf_counter() - start
+
+        if recheck.valid:
+            print(f"\nDay {day} part 1 re-checked in {recheck_done - part1_verified:.1f}s "
+                  f"(median run {statistics.median(recheck.durations):.2f}s) while part 2 was in progress")
+            part2_path = await part2
+            total = time.perf_counter() - start
+            print(f"\nDay {day} finished in {total:.1f}s: part 1 {part1_path.name}, "
+                  f"part 2 {part2_path.name if part2_path else 'not solved'} "
+                  f"({recheck_done - part1_verified:.1f}s of part 1 checks overlapped with part 2)")
+            return part1_path, part2_path
+
+        # The part 2 thread stops before its next LLM call, but it has to be waited for so it
+        # doesn't write attempt files alongside the restarted part 2
+        cancel.set()
+        print(f"\nDay {day} part 1 invalidated by the re-check, cancelling part 2: {recheck.feedback}")
+        await part2
+        rejected_solution = (part1_path.read_text(), recheck.feedback)
+
+    print(f"\nGiving up on day {day}: part 1 was invalidated {max_restarts + 1} times")
+    return None, None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve both parts of a day, overlapping part 1 checks with part 2")
+    parser.add_argument("day", type=int)
+    parser.add_argument("--provider", type=ModelProvider, default=ModelProvider.OPENAI)
+    parser.add_argument("--model", default="gpt-4o")
+    parser.add_argument("--max-attempts", type=int, default=5)
+    parser.add_argument("--recheck-runs", type=int, default=3)
+    parser.add_argument("--repair", action="store_true",
+                        help="Ask for SEARCH/REPLACE edits to the last attempt instead of whole programs")
+    args = parser.parse_args()
+
+    asyncio.run(solve_day_pipelined(
+        day=args.day,
+        provider=args.provider,
+        model_name=args.model,
+        max_attempts=args.max_attempts,
+        recheck_runs=args.recheck_runs,
+        repair_mode=args.repair
+    ))
@@ -0,0 +1,206 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# (requests per minute, tokens per minute), conservative enough for low usage tiers
+DEFAULT_LIMITS = {
+    "openai": (500, 30_000),
+    "anthropic": (50, 40_000),
+    # Local servers have no quota, only their own throughput
+    "local": (10_000, 10_000_000),
+}
+FALLBACK_LIMITS = (60, 100_000)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call is still being rate limited after every retry."""
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an exception from a provider client is a 429-style rate limit error."""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    if "RateLimit" in type(error).__name__:
+        return True
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "rate_limit" in message
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """The delay a provider asked for in its Retry-After header, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """A token bucket refilled continuously up to its capacity (e.g. N per minute)."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.available = capacity
+        self.updated = time.monotonic()
+
+    def try_acquire(self, amount: float) -> float:
+        """Take `amount` if available and return 0, otherwise return how long to wait for it."""
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+        # A single request bigger than the bucket can only ever wait for a full bucket
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            self.available -= amount
+            return 0.0
+        return (amount - self.available) / self.refill_per_second
+
+
+class ProviderRateLimiter:
+    """
+    Paces calls to one provider with requests-per-minute and tokens-per-minute buckets.
+
+    Calls wait for both buckets before being sent and are retried with jittered
+    exponential backoff when the provider still answers with a rate limit error.
+    Works for both threads and asyncio tasks, and keeps queue-depth metrics.
+    """
+
+    def __init__(self,
+                 requests_per_minute: int,
+                 tokens_per_minute: int,
+                 max_retries: int = 6,
+                 base_delay: float = 1.0,
+                 max_delay: float = 60.0):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.calls = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            request_wait = self.requests.try_acquire(1)
+            if request_wait:
+                return request_wait
+            token_wait = self.tokens.try_acquire(tokens)
+            if token_wait:
+                # Give the request back so it isn't lost while waiting for tokens
+                self.requests.available += 1
+            return token_wait
+
+    def _enter_queue(self):
+        with self._lock:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+    def _leave_queue(self, waited: float):
+        with self._lock:
+            self.queue_depth -= 1
+            self.calls += 1
+            self.total_wait += waited
+
+    def _backoff(self, error: BaseException, attempt: int) -> float:
+        with self._lock:
+            self.throttled += 1
+        # Full jitter, unless the provider told us how long to wait
+        return retry_after(error) or random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def acquire(self, tokens: int):
+        """Block until a request of roughly `tokens` tokens may be sent."""
+        self._enter_queue()
+        start = time.monotonic()
+        try:
+            while wait := self._reserve(tokens):
+                time.sleep(wait)
+        finally:
+            self._leave_queue(time.monotonic() - start)
+
+    async def aacquire(self, tokens: int):
+        """Wait without blocking the event loop until a request of roughly `tokens` tokens may be sent."""
+        self._enter_queue()
+        start = time.monotonic()
+        try:
+            while wait := self._reserve(tokens):
+                await asyncio.sleep(wait)
+        finally:
+            self._leave_queue(time.monotonic() - start)
+
+    def run(self, call: Callable[[], T], tokens: int) -> T:
+        """Run a provider call once the limits allow it, retrying rate limit errors."""
+        for attempt in range(self.max_retries + 1):
+            self.acquire(tokens)
+            try:
+                return call()
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                if attempt == self.max_retries:
+                    raise RateLimitExceeded(f"Still rate limited after {self.max_retries} retries: {e}") from e
+                delay = self._backoff(e, attempt)
+                print(f"Rate limited, retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    async def arun(self, call: Callable[[], Awaitable[T]], tokens: int) -> T:
+        """Async version of run: `call` creates a new coroutine for every try."""
+        for attempt in range(self.max_retries + 1):
+            await self.aacquire(tokens)
+            try:
+                return await call()
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                if attempt == self.max_retries:
+                    raise RateLimitExceeded(f"Still rate limited after {self.max_retries} retries: {e}") from e
+                delay = self._backoff(e, attempt)
+                print(f"Rate limited, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "average_wait": self.total_wait / self.calls if self.calls else 0.0
+            }
+
+
+_limiters: dict[str, ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> ProviderRateLimiter:
+    """The process-wide rate limiter for a provider, so every solver shares the same budget."""
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = ProviderRateLimiter(*DEFAULT_LIMITS.get(provider, FALLBACK_LIMITS))
+        return _limiters[provider]
+
+
+def format_rate_limiter_metrics() -> str:
+    """Summarise the queueing and throttling seen by every provider's rate limiter."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+
+    lines = []
+    for provider, limiter in sorted(limiters.items()):
+        metrics = limiter.metrics()
+        lines.append(f"{provider}: {metrics['calls']} calls, {metrics['throttled']} rate limited, "
+                     f"max queue depth {metrics['max_queue_depth']}, "
+                     f"average wait {metrics['average_wait']:.2f}s")
+    return "\n".join(lines)
@@ -0,0 +1,101 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.resolve()
+DEFAULT_HISTORY_PATH = BASE_DIR / ".aoc" / "startup_bench.json"
+DEFAULT_MODULES = ["aoc_llm_solver", "aoc_batch"]
+
+
+def measure_import(module: str) -> tuple[float, dict[str, float]]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        The cumulative import time of the module in seconds, and the cumulative
+        import time of every module it pulled in
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total, name = line.split("|")
+        cumulative[name.strip()] = int(total) / 1_000_000
+    return cumulative[module], cumulative
+
+
+def benchmark(module: str, runs: int = 5, top: int = 5) -> dict:
+    """Measure the cold start of a module over several fresh interpreters."""
+    import_times = []
+    process_times = []
+    heaviest = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        import_time, cumulative = measure_import(module)
+        process_times.append(time.perf_counter() - start)
+        import_times.append(import_time)
+        for name, seconds in cumulative.items():
+            heaviest[name] = max(heaviest.get(name, 0.0), seconds)
+
+    # Only report top-level packages, nested modules are already counted in their parent
+    top_level = {name: seconds for name, seconds in heaviest.items() if "." not in name and name != module}
+    return {
+        "module": module,
+        "runs": runs,
+        "median_import": statistics.median(import_times),
+        "median_process": statistics.median(process_times),
+        "heaviest_imports": dict(sorted(top_level.items(), key=lambda item: -item[1])[:top])
+    }
+
+
+def load_history(history_path: Path) -> list[dict]:
+    if not history_path.exists():
+        return []
+    with open(history_path, "r") as f:
+        return json.load(f)
+
+
+def save_history(history_path: Path, history: list[dict]):
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(history_path, "w") as f:
+        json.dump(history, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Track the cold-start import time of the solver modules")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY_PATH)
+    parser.add_argument("--no-save", action="store_true", help="Don't append the results to the history")
+    args = parser.parse_args()
+
+    history = load_history(args.history)
+    for module in args.modules:
+        result = benchmark(module, args.runs)
+        previous = next((entry for entry in reversed(history) if entry["module"] == module), None)
+
+        change = ""
+        if previous:
+            change = f" ({result['median_import'] - previous['median_import']:+.3f}s vs previous run)"
+        print(f"{module}: {result['median_import']:.3f}s import, "
+              f"{result['median_process']:.3f}s process start{change}")
+        for name, seconds in result["heaviest_imports"].items():
+            print(f"  {name:<30}{seconds:.3f}s")
+
+        history.append({**result, "timestamp": time.time()})
+
+    if not args.no_save:
+        save_history(args.history, history)
@@ -0,0 +1,131 @@
+import keyword
+import re
+from pathlib import Path
+from typing import Optional
+
+# Markdown headings, bold text, bullets and numbered lists never start a line of Python
+MARKDOWN_PATTERN = re.compile(r"^(#{2,}\s|\*\*|[-*]\s|\d+\.\s)")
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'’,!?.:]*")
+
+# Compile errors that just mean the code so far ends inside a string or brackets
+INCOMPLETE_ERRORS = ("unterminated triple-quoted string", "was never closed", "unexpected EOF")
+# Lines that carry on the block above them at column 0, e.g. the `except` of a top-level `try`
+CONTINUATION_PATTERN = re.compile(r"^(except|finally|else|elif|case)\b")
+
+
+def is_prose(line: str) -> bool:
+    """Whether a top-level line is clearly English (or markdown) rather than Python."""
+    stripped = line.strip()
+    if MARKDOWN_PATTERN.match(stripped):
+        return True
+
+    words = stripped.split()
+    if len(words) < 3 or words[0] in keyword.kwlist or words[0] in keyword.softkwlist:
+        return False
+    return all(WORD_PATTERN.fullmatch(word) for word in words[:3])
+
+
+class SolutionStreamWriter:
+    """
+    Writes a streamed solution to disk as it arrives and decides when to stop generating.
+
+    Each completed top-level block is compiled as soon as the next top-level line starts.
+    Generation should stop when the response opens with prose instead of code, when the
+    code is followed by an explanation (prose, a markdown heading or a closing fence),
+    or when a finished block doesn't compile.
+    """
+
+    def __init__(self, solution_path: Path):
+        self.solution_path = solution_path
+        self.solution_path.parent.mkdir(parents=True, exist_ok=True)
+        self.abort_reason: Optional[str] = None
+        self._file = open(solution_path, "w", encoding="utf-8")
+        self._received = ""
+        self._pending = ""
+        self._lines: list[str] = []
+        self._in_fence = False
+
+    @property
+    def started(self) -> bool:
+        return bool(self._lines)
+
+    def feed(self, text: str) -> bool:
+        """Add streamed text, returning False once generation should be aborted."""
+        if self.abort_reason:
+            return False
+
+        self._received += text
+        self._pending += text
+        while "\n" in self._pending:
+            line, self._pending = self._pending.split("\n", 1)
+            if not self._accept(line):
+                return False
+        return True
+
+    def _accept(self, line: str) -> bool:
+        if line.lstrip().startswith("```"):
+            if not self.started and not self._in_fence:
+                self._in_fence = True
+                return True
+            return self._abort("the code block finished")
+
+        if not line.strip():
+            if self.started:
+                self._write(line)
+            return True
+
+        if not line[0].isspace() and not self._skip_checks(line):
+            syntax_error = self._syntax_error()
+            if syntax_error is None or not any(error in syntax_error for error in INCOMPLETE_ERRORS):
+                if is_prose(line):
+                    return self._abort("an explanation followed the code" if self.started
+                                       else "the response started with prose instead of Python")
+                if syntax_error is not None:
+                    return self._abort(f"the code has a syntax error: {syntax_error}")
+
+        self._write(line)
+        return True
+
+    def _skip_checks(self, line: str) -> bool:
+        # Comments can sit at column 0 inside a block, and neither a decorator nor a block that
+        # continues with except/else/... is complete before the next line
+        if line.startswith("#") and not MARKDOWN_PATTERN.match(line):
+            return True
+        if CONTINUATION_PATTERN.match(line):
+            return True
+        last_line = next((previous for previous in reversed(self._lines) if previous.strip()), "")
+        return last_line.startswith("@")
+
+    def _syntax_error(self) -> Optional[str]:
+        if not self.started:
+            return None
+        try:
+            compile("\n".join(self._lines) + "\n", str(self.solution_path), "exec")
+        except SyntaxError as e:
+            return f"{e.msg} (line {e.lineno})"
+        return None
+
+    def _write(self, line: str):
+        self._lines.append(line)
+        self._file.write(line + "\n")
+        self._file.flush()
+
+    def _abort(self, reason: str) -> bool:
+        self.abort_reason = reason
+        return False
+
+    def close(self) -> str:
+        """Finish writing and return the solution that was kept."""
+        if self._pending and not self.abort_reason:
+            self._accept(self._pending)
+        self._file.close()
+
+        if not self.started:
+            # Nothing usable came through, keep the raw response so running it explains why
+            solution = self._received
+        else:
+            solution = "\n".join(self._lines).rstrip() + "\n"
+
+        with open(self.solution_path, "w", encoding="utf-8") as f:
+            f.write(solution)
+        return solution
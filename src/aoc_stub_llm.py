@@ -0,0 +1,79 @@
+import asyncio
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+
+class StubRateLimitError(Exception):
+    """Mimics the 429 errors raised by provider clients."""
+    status_code = 429
+
+
+class StubChatModel(BaseChatModel):
+    """
+    Offline chat model that replays canned responses.
+
+    Useful for exercising the solver without calling a real provider. Responses and
+    delays are cycled through in order, one per call, so concurrent candidates can be
+    made to arrive in a chosen order. Setting requests_per_minute makes it throttle
+    like a real provider, rejecting calls over the limit with a 429-style error.
+    """
+
+    responses: list[str]
+    delays: list[float] = [0.0]
+    requests_per_minute: Optional[int] = None
+
+    _calls: Any = PrivateAttr(default=None)
+    _recent_calls: Any = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._calls = itertools.count()
+        self._recent_calls = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _throttle(self):
+        if self.requests_per_minute is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            while self._recent_calls and now - self._recent_calls[0] > 60:
+                self._recent_calls.popleft()
+            if len(self._recent_calls) >= self.requests_per_minute:
+                raise StubRateLimitError("Error code: 429 - rate limit exceeded")
+            self._recent_calls.append(now)
+
+    def _next_response(self) -> tuple[str, float]:
+        self._throttle()
+        call = next(self._calls)
+        return self.responses[call % len(self.responses)], self.delays[call % len(self.delays)]
+
+    def _generate(self,
+                  messages: list[BaseMessage],
+                  stop: Optional[list[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None,
+                  **kwargs: Any) -> ChatResult:
+        response, delay = self._next_response()
+        time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=response))])
+
+    async def _agenerate(self,
+                         messages: list[BaseMessage],
+                         stop: Optional[list[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                         **kwargs: Any) -> ChatResult:
+        response, delay = self._next_response()
+        await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=response))])
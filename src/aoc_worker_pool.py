@@ -0,0 +1,332 @@
+import argparse
+import atexit
+import json
+import os
+import queue
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from aoc_executor import (DEFAULT_CPU_TIME_SECONDS, DEFAULT_MEMORY_LIMIT_MB, DEFAULT_TIMEOUT_SECONDS, ExecutionResult,
+                          run_solution)
+
+BASE_DIR = Path(__file__).parent.resolve()
+
+# Modules solutions import all the time; numpy is only preloaded when it's installed
+PRELOAD_MODULES = ["collections", "itertools", "functools", "heapq", "math", "re", "typing", "dataclasses",
+                   "bisect", "string", "copy", "operator", "numpy"]
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+# A long-lived interpreter that imports the common modules once, then forks a child per run.
+# Requests and results are JSON lines on its original stdin/stdout; fds 0 and 1 are pointed at
+# /dev/null so nothing the zygote or its children print can corrupt the protocol.
+ZYGOTE_SCRIPT = """
+import importlib, json, os, resource, runpy, select, signal, sys, time, traceback
+
+def forked_child_mb():
+    # Peak RSS of a child that exits straight away, i.e. what every child inherits from the zygote
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0)
+    return os.wait4(pid, 0)[2].ru_maxrss / 1024
+
+bare_interpreter_mb = forked_child_mb()
+for module in sys.argv[1:]:
+    try:
+        importlib.import_module(module)
+    except ImportError:
+        pass
+# Children start out with the preloaded modules in their RSS, which a cold run wouldn't have
+preloaded_mb = max(0.0, forked_child_mb() - bare_interpreter_mb)
+
+requests = os.fdopen(os.dup(0), "r")
+responses = os.dup(1)
+devnull = os.open(os.devnull, os.O_RDWR)
+os.dup2(devnull, 0)
+os.dup2(devnull, 1)
+
+def respond(message):
+    os.write(responses, (json.dumps(message) + "\\n").encode())
+
+def run_child(request):
+    os.close(responses)
+    path = request["path"]
+    os.chdir(os.path.dirname(path))
+    for fd, name in ((1, "stdout"), (2, "stderr")):
+        os.dup2(os.open(request[name], os.O_WRONLY | os.O_CREAT | os.O_TRUNC), fd)
+    limit_bytes = request["memory_limit_mb"] * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+    if request["cpu_time_limit"] is not None:
+        seconds = max(1, int(request["cpu_time_limit"]))
+        resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds + 1))
+
+    # What `python solution.py` would see
+    sys.argv = [path]
+    sys.path[0] = os.path.dirname(path)
+    code = 0
+    try:
+        runpy.run_path(path, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            code = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException as e:
+        # Drop the zygote and runpy frames so the traceback reads like a plain run's
+        tb = e.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != path:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb)
+        code = 1
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    except BaseException:
+        pass
+    os._exit(code)
+
+respond({"ready": True})
+for line in requests:
+    request = json.loads(line)
+    start = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        run_child(request)
+
+    # Wait on a pidfd so the child can be killed on timeout before it's reaped (no pid reuse race)
+    pidfd = os.pidfd_open(pid)
+    timed_out = not select.select([pidfd], [], [], request["timeout"])[0]
+    if timed_out:
+        os.kill(pid, signal.SIGKILL)
+    _, status, usage = os.wait4(pid, 0)
+    os.close(pidfd)
+    respond({
+        "returncode": os.waitstatus_to_exitcode(status),
+        "duration": time.perf_counter() - start,
+        "timed_out": timed_out,
+        "cpu_time": usage.ru_utime + usage.ru_stime,
+        "peak_memory_mb": max(0.0, usage.ru_maxrss / 1024 - preloaded_mb)
+    })
+"""
+
+
+class WorkerError(RuntimeError):
+    """A zygote process died or stopped following the protocol."""
+
+
+class _Worker:
+    """One zygote process and the scratch files its children write their output to."""
+
+    def __init__(self, preload: list[str]):
+        self.scratch = tempfile.TemporaryDirectory(prefix="aoc_worker_")
+        self.stdout_path = Path(self.scratch.name) / "stdout"
+        self.stderr_path = Path(self.scratch.name) / "stderr"
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", ZYGOTE_SCRIPT, *preload],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True
+        )
+        self.ready = False
+
+    def _read_message(self) -> dict:
+        line = self.process.stdout.readline()
+        if not line:
+            raise WorkerError(f"Worker {self.process.pid} exited with code {self.process.poll()}")
+        return json.loads(line)
+
+    def execute(self, solution_path: Path, timeout: float, memory_limit_mb: int,
+                cpu_time_limit: Optional[float]) -> tuple[dict, str, str]:
+        if not self.ready:
+            self._read_message()
+            self.ready = True
+        request = {
+            "path": str(solution_path),
+            "stdout": str(self.stdout_path),
+            "stderr": str(self.stderr_path),
+            "timeout": timeout,
+            "memory_limit_mb": memory_limit_mb,
+            "cpu_time_limit": cpu_time_limit
+        }
+        try:
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+        except BrokenPipeError as e:
+            raise WorkerError(f"Worker {self.process.pid} has exited") from e
+        outcome = self._read_message()
+        return (outcome,
+                self.stdout_path.read_text(errors="replace"),
+                self.stderr_path.read_text(errors="replace"))
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.process.stdout.close()
+        self.scratch.cleanup()
+
+
+class WorkerPool:
+    """
+    Pre-forked workers for running solutions without paying interpreter startup each time.
+
+    Each worker is a zygote interpreter with the common modules already imported. A run
+    forks a child of an idle zygote, which runs the solution with the same cwd, argv,
+    `__file__` and `__name__ == "__main__"` as `python solution.py` and the same memory
+    and CPU limits as `run_solution`. The zygote itself is never touched by a solution,
+    so every run starts from the same clean state.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, preload: Optional[list[str]] = None):
+        self.preload = PRELOAD_MODULES if preload is None else preload
+        self._lock = threading.Lock()
+        self._closed = False
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        # Start them all now so they boot in parallel, they're only waited for on first use
+        self._workers = [_Worker(self.preload) for _ in range(workers)]
+        for worker in self._workers:
+            self._idle.put(worker)
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        worker.close()
+        with self._lock:
+            replacement = _Worker(self.preload)
+            self._workers[self._workers.index(worker)] = replacement
+        return replacement
+
+    def run(self,
+            solution_path: Path,
+            expected_answer: Optional[str] = None,
+            timeout: float = DEFAULT_TIMEOUT_SECONDS,
+            memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB,
+            cpu_time_limit: Optional[float] = DEFAULT_CPU_TIME_SECONDS) -> ExecutionResult:
+        """
+        Run a solution on the next idle worker, blocking until one is free.
+
+        A worker that dies is replaced and the run is retried once on the replacement.
+        """
+        if self._closed:
+            raise ValueError("The worker pool has been closed")
+        solution_path = solution_path.resolve()
+        if not solution_path.exists():
+            raise FileNotFoundError(f"No solution found at {solution_path}")
+
+        worker = self._idle.get()
+        try:
+            start = time.perf_counter()
+            try:
+                outcome, stdout, stderr = worker.execute(solution_path, timeout, memory_limit_mb, cpu_time_limit)
+            except WorkerError as e:
+                print(f"{e}, starting a new worker")
+                worker = self._replace(worker)
+                start = time.perf_counter()
+                outcome, stdout, stderr = worker.execute(solution_path, timeout, memory_limit_mb, cpu_time_limit)
+            duration = time.perf_counter() - start
+        finally:
+            self._idle.put(worker)
+
+        return ExecutionResult(
+            solution_path=solution_path,
+            returncode=outcome["returncode"],
+            stdout=stdout,
+            stderr=stderr,
+            duration=duration,
+            timed_out=outcome["timed_out"],
+            expected_answer=expected_answer,
+            cpu_time=outcome["cpu_time"],
+            peak_memory_mb=outcome["peak_memory_mb"],
+            cpu_limited=outcome["returncode"] == -signal.SIGXCPU or (
+                cpu_time_limit is not None and outcome["cpu_time"] >= cpu_time_limit
+            )
+        )
+
+    def close(self):
+        self._closed = True
+        for worker in self._workers:
+            worker.close()
+
+
+_shared_pool: Optional[WorkerPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> WorkerPool:
+    """The process-wide worker pool, started on first use and shut down at exit."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = WorkerPool()
+            atexit.register(_shared_pool.close)
+        return _shared_pool
+
+
+def benchmark(solution_paths: list[Path], runs: int = 5, timeout: float = 10.0, workers: int = 1) -> list[dict]:
+    """
+    Time cold `python solution.py` launches against warm pool runs of the same files.
+
+    Returns:
+        The median cold and warm wall time of each file, and whether it hit the timeout
+    """
+    pool = WorkerPool(workers)
+    try:
+        # The first run waits for the zygote to finish booting, which isn't what we're measuring
+        pool.run(solution_paths[0], timeout=timeout)
+        results = []
+        for solution_path in solution_paths:
+            cold = [run_solution(solution_path, timeout=timeout, profile_seconds=None) for _ in range(runs)]
+            warm = [pool.run(solution_path, timeout=timeout) for _ in range(runs)]
+            results.append({
+                "solution": solution_path,
+                "cold": statistics.median(result.duration for result in cold),
+                "warm": statistics.median(result.duration for result in warm),
+                "too_slow": any(result.too_slow for result in cold + warm)
+            })
+        return results
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare cold subprocess launches with the pre-forked worker pool")
+    parser.add_argument("solutions", nargs="*", type=Path,
+                        help="Solution files to run (defaults to the first attempt at each day and part)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=10.0, help="Wall-clock limit per run in seconds")
+    args = parser.parse_args()
+
+    solutions = [path.resolve() for path in args.solutions]
+    if not solutions:
+        first_attempts: dict[tuple[str, str], Path] = {}
+        for path in sorted(BASE_DIR.glob("day*/solution_part*.py")):
+            first_attempts.setdefault((path.parent.name, path.name[:len("solution_partN")]), path)
+        solutions = sorted(first_attempts.values(), key=lambda path: (int(path.parent.name[3:]), path.name))
+    with tempfile.TemporaryDirectory() as scratch:
+        # Pure launch overhead: a solution that does nothing
+        empty_solution = Path(scratch) / "solution_empty.py"
+        empty_solution.write_text("pass\n")
+        rows = benchmark([empty_solution, *solutions], args.runs, args.timeout)
+
+    print(f"{'Solution':<46}{'Cold':>10}{'Warm':>10}{'Saved':>10}")
+    for row in rows:
+        path = row["solution"]
+        name = str(path.relative_to(BASE_DIR)) if path.is_relative_to(BASE_DIR) else "(empty script)"
+        print(f"{name:<46}{row['cold'] * 1000:>8.1f}ms{row['warm'] * 1000:>8.1f}ms"
+              f"{(row['cold'] - row['warm']) * 1000:>8.1f}ms{'  (too slow)' if row['too_slow'] else ''}")
+    # Runs cut off at the timeout take as long either way
+    finished = [row for row in rows if not row["too_slow"]]
+    cold_total = sum(row["cold"] for row in finished)
+    warm_total = sum(row["warm"] for row in finished)
+    print(f"\n{len(finished)} finished: {cold_total:.2f}s cold vs {warm_total:.2f}s warm "
+          f"({cold_total / warm_total:.1f}x, {(cold_total - warm_total) / len(finished) * 1000:.0f}ms saved per run)")
@@ -0,0 +1,39 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+import aoc_description
+from aoc_attempt_index import AttemptIndex
+from aoc_description import DescriptionCache
+from aoc_ledger import CallLedger
+from aoc_rate_limiter import ProviderRateLimiter
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+# A day number no real puzzle uses, so tests never touch a real day directory
+TEST_DAY = 99
+
+
+@pytest.fixture
+def puzzle_day(tmp_path, monkeypatch):
+    """A throwaway src/day99 with an input and a part 1 description, removed afterwards."""
+    day_dir = SRC_DIR / f"day{TEST_DAY}"
+    (day_dir / "input").mkdir(parents=True)
+    (day_dir / "input" / "input.txt").write_text("1234\n5678\n")
+    (day_dir / "input" / "description_part1.txt").write_text(
+        "--- Day 99: Test ---\nAdd up the numbers in your puzzle input.\nWhat is the sum?\n")
+    # Parsed descriptions are cached in src/.aoc otherwise
+    monkeypatch.setattr(aoc_description, "_shared_cache", DescriptionCache(tmp_path / "descriptions.json"))
+    yield day_dir
+    shutil.rmtree(day_dir)
+
+
+@pytest.fixture
+def solver_options(tmp_path):
+    """Solver arguments that keep the ledger, attempt index and rate limits out of src/.aoc and shared state."""
+    return {
+        "ledger": CallLedger(tmp_path / "ledger.jsonl"),
+        "attempt_index": AttemptIndex(tmp_path / "attempts.sqlite"),
+        "rate_limiter": ProviderRateLimiter(10_000, 10_000_000)
+    }
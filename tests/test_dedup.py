@@ -0,0 +1,51 @@
+from aoc_dedup import fingerprint
+
+
+def test_renamed_identifiers_comments_and_hints_are_duplicates():
+    first = '''
+def count(values: list[int]) -> int:
+    """Count the positives."""
+    total: int = 0
+    for value in values:
+        total += value > 0  # booleans add up
+    return total
+
+print(count([1, -2, 3]))
+'''
+    second = '''
+def positives(xs):
+    n: float = 0
+    for x in xs:
+        n += x > 0
+    return n
+
+print(positives([1, -2, 3]))
+'''
+    assert fingerprint(first) == fingerprint(second)
+
+
+def test_dataclasses_with_different_fields_are_not_duplicates():
+    template = '''
+from dataclasses import dataclass
+
+@dataclass
+class Point:
+    x: int
+{extra}
+print(Point(1{args}))
+'''
+    one_field = template.format(extra="", args="")
+    two_fields = template.format(extra="    y: int\n", args=", 2")
+    assert fingerprint(one_field) != fingerprint(two_fields)
+
+
+def test_keyword_arguments_follow_renamed_parameters():
+    first = "def f(a, b=2):\n    return a - b\n\nprint(f(3, b=4))\n"
+    second = "def f(b, a=2):\n    return b - a\n\nprint(f(3, b=4))\n"
+    assert fingerprint(first) != fingerprint(second)
+    # Consistently renaming the parameter and its keyword is still a duplicate
+    assert fingerprint(first) == fingerprint(first.replace("b", "c"))
+
+
+def test_library_keywords_keep_their_names():
+    assert fingerprint("print(sorted([3, 1], key=abs))") != fingerprint("print(sorted([3, 1], reverse=abs))")
@@ -0,0 +1,15 @@
+from aoc_input_generators import _reachable_without_concatenation, generate_input
+
+
+def test_small_lab_maps():
+    for size in range(1, 9):
+        rows = generate_input(6, size).split()
+        assert len(rows) == size and "".join(rows).count("^") == 1
+
+
+def test_a_third_of_the_calibrations_need_concatenation():
+    equations = [line.split(": ") for line in generate_input(7, 4).splitlines()]
+    reachable = [_reachable_without_concatenation(int(target), list(map(int, operands.split())))
+                 for target, operands in equations]
+    # All 67 of the + and * third, none of the || third, and rarely a made-up target that happens to work
+    assert 67 <= sum(reachable) <= 75
@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+from aoc_llm_solver import AoCLLMSolver, ModelProvider
+from aoc_local_llm import ChatLocal, LocalInferenceClient
+from aoc_local_server import StandInServer
+from conftest import TEST_DAY
+
+PROGRAM = "print(sum(map(int, open('input/input.txt').read().split())))\n"
+
+
+@pytest.fixture
+def server():
+    server = StandInServer(("127.0.0.1", 0), [PROGRAM]).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_chat_local_round_trip(server):
+    reply = ChatLocal(model="stand-in", base_url=server.base_url).invoke("Solve it")
+
+    assert reply.content == PROGRAM
+    assert reply.usage_metadata["output_tokens"] == len(PROGRAM) // 4
+
+
+def test_identical_concurrent_requests_are_batched(server):
+    client = LocalInferenceClient(server.base_url, batch_window=0.2)
+    body = {"model": "stand-in", "messages": [{"role": "user", "content": "Solve it"}]}
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(client.complete(body))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 3
+    assert server.requests == 1
+    assert client.metrics()["completions_received"] == 3
+
+
+def test_servers_that_ignore_n_get_the_rest_one_by_one():
+    server = StandInServer(("127.0.0.1", 0), [PROGRAM], supports_n=False).start()
+    try:
+        client = LocalInferenceClient(server.base_url, batch_window=0.2)
+        body = {"model": "stand-in", "messages": [{"role": "user", "content": "Solve it"}]}
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(client.complete(body))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 3
+        assert server.requests == 3
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_solver_with_the_local_provider(server, puzzle_day, solver_options, monkeypatch):
+    monkeypatch.setenv("AOC_LOCAL_BASE_URL", server.base_url)
+    # A model name of its own, so the shared chat model registry doesn't hand back another test's
+    solver = AoCLLMSolver(day=TEST_DAY, part=1, provider=ModelProvider.LOCAL,
+                          model_name=f"stand-in-{server.server_address[1]}", **solver_options)
+
+    solution = solver.generate_solution()
+
+    assert "print(sum(" in solution
+    record, = solver_options["ledger"].records()
+    assert record.provider == "local" and record.cost == 0.0
@@ -0,0 +1,50 @@
+import asyncio
+import time
+from pathlib import Path
+
+from aoc_llm_solver import AoCLLMSolver, ModelProvider, race_candidates
+from aoc_stub_llm import StubChatModel
+from conftest import TEST_DAY
+
+WRONG = "print('wrong')\n"
+RIGHT = "print('right')\n"
+NEVER = "print('never needed')\n"
+
+
+def stub_solver(responses: list[str], delays: list[float], solver_options: dict) -> AoCLLMSolver:
+    return AoCLLMSolver(day=TEST_DAY, part=1, provider=ModelProvider.OPENAI, model_name="stub",
+                        llm=StubChatModel(responses=responses, delays=delays), **solver_options)
+
+
+async def passes(solution_path: Path) -> bool:
+    return "right" in solution_path.read_text()
+
+
+def test_first_verified_candidate_wins_and_the_rest_are_cancelled(puzzle_day, solver_options):
+    solver = stub_solver([WRONG, RIGHT, NEVER], [0.0, 0.1, 30.0], solver_options)
+
+    start = time.perf_counter()
+    winner = asyncio.run(race_candidates([solver], 3, passes))
+
+    assert winner is not None and "right" in winner.read_text()
+    # The 30s candidate was cancelled rather than waited for
+    assert time.perf_counter() - start < 10
+    assert not solver.solution_path(3).exists()
+
+
+def test_race_without_a_correct_candidate_returns_none(puzzle_day, solver_options):
+    solver = stub_solver([WRONG], [0.0], solver_options)
+
+    assert asyncio.run(race_candidates([solver], 2, passes)) is None
+
+
+def test_duplicate_candidates_are_only_verified_once(puzzle_day, solver_options):
+    solver = stub_solver([WRONG, WRONG.replace("'wrong'", '"wrong"')], [0.0, 0.05], solver_options)
+    verified = []
+
+    async def record(solution_path: Path) -> bool:
+        verified.append(solution_path)
+        return False
+
+    asyncio.run(race_candidates([solver], 2, record))
+    assert len(verified) == 1
@@ -0,0 +1,109 @@
+import types
+
+import pytest
+
+import aoc_rate_limiter
+import aoc_stub_llm
+from aoc_rate_limiter import ProviderRateLimiter, RateLimitExceeded
+from aoc_stub_llm import StubChatModel, StubRateLimitError
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping just moves the clock forward."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    fake_time = types.SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep)
+    monkeypatch.setattr(aoc_rate_limiter, "time", fake_time)
+    monkeypatch.setattr(aoc_stub_llm, "time", fake_time)
+    return clock
+
+
+class RetryAfterError(Exception):
+    def __init__(self, seconds: str):
+        super().__init__("Error code: 429 - rate limit exceeded")
+        self.response = types.SimpleNamespace(headers={"retry-after": seconds})
+
+
+def test_requests_are_paced_to_the_requests_per_minute(clock):
+    limiter = ProviderRateLimiter(requests_per_minute=2, tokens_per_minute=1_000_000)
+
+    for _ in range(4):
+        limiter.run(lambda: None, tokens=10)
+
+    # Two calls fit in the full bucket, the next two wait 30s each for a refill
+    assert clock.now - 1000.0 == pytest.approx(60.0)
+    assert limiter.metrics()["calls"] == 4
+
+
+def test_large_requests_wait_for_the_token_bucket(clock):
+    limiter = ProviderRateLimiter(requests_per_minute=1000, tokens_per_minute=6000)
+
+    limiter.run(lambda: None, tokens=6000)
+    limiter.run(lambda: None, tokens=3000)
+
+    assert clock.now - 1000.0 == pytest.approx(30.0)
+
+
+def test_rate_limit_errors_are_retried_with_bounded_backoff(clock):
+    model = StubChatModel(responses=["ok"], requests_per_minute=2)
+    # The limiter allows more than the stub does, so the stub answers with 429s
+    limiter = ProviderRateLimiter(requests_per_minute=100, tokens_per_minute=1_000_000, base_delay=1.0, max_retries=10)
+
+    replies = [limiter.run(lambda: model.invoke("hi").content, tokens=10) for _ in range(3)]
+
+    assert replies == ["ok", "ok", "ok"]
+    assert limiter.metrics()["throttled"] >= 1
+    # Full jitter never waits longer than base_delay * 2 ** attempt (capped at max_delay)
+    backoffs = [seconds for seconds in clock.sleeps if seconds > 1]
+    assert all(seconds <= limiter.max_delay for seconds in backoffs)
+    # The stub only lets a call through once the first one is a minute old
+    assert clock.now - 1000.0 > 60
+
+
+def test_retry_after_header_is_respected(clock):
+    limiter = ProviderRateLimiter(requests_per_minute=100, tokens_per_minute=1_000_000)
+    errors = [RetryAfterError("7")]
+
+    def call():
+        if errors:
+            raise errors.pop()
+        return "done"
+
+    assert limiter.run(call, tokens=10) == "done"
+    assert 7.0 in clock.sleeps
+
+
+def test_gives_up_after_max_retries(clock):
+    limiter = ProviderRateLimiter(requests_per_minute=100, tokens_per_minute=1_000_000, max_retries=2)
+
+    def call():
+        raise StubRateLimitError("Error code: 429 - rate limit exceeded")
+
+    with pytest.raises(RateLimitExceeded):
+        limiter.run(call, tokens=10)
+    assert limiter.metrics()["throttled"] == 2
+
+
+def test_other_errors_are_not_retried(clock):
+    limiter = ProviderRateLimiter(requests_per_minute=100, tokens_per_minute=1_000_000)
+
+    def call():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        limiter.run(call, tokens=10)
+    assert limiter.metrics()["throttled"] == 0
@@ -0,0 +1,15 @@
+from aoc_llm_solver import AoCLLMSolver, ModelProvider
+from aoc_stub_llm import StubChatModel
+from conftest import TEST_DAY
+
+
+def test_last_saved_attempt_only_counts_this_models_tries(puzzle_day, solver_options):
+    solver = AoCLLMSolver(day=TEST_DAY, part=1, provider=ModelProvider.OPENAI, model_name="gpt-4",
+                          llm=StubChatModel(responses=["print(1)\n"]), **solver_options)
+    assert solver.last_saved_attempt() == 0
+
+    for name in ["solution_part1_try3_openai_gpt_4.py", "solution_part1_try12_openai_gpt_4.py",
+                 "solution_part1_try40_openai_gpt_4o.py", "solution_part2_try50_openai_gpt_4.py"]:
+        (puzzle_day / name).write_text("print(1)\n")
+
+    assert solver.last_saved_attempt() == 12